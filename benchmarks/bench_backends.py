@@ -0,0 +1,128 @@
+"""Perbandingan CPU server: backend grafik matplotlib (PNG) vs vega (Vega-Lite).
+
+Dua pengukuran:
+
+1. per grafik (in-process): waktu CPU untuk membuat satu grafik dari tabel
+   agregatnya. matplotlib = ``create_*`` + rasterisasi PNG; vega = ``vega_*`` +
+   serialisasi JSON spesifikasi. Ukuran yang dikirim ke browser (PNG vs JSON)
+   ikut dicatat.
+2. per rerun halaman (AppTest di proses baru per backend): waktu CPU proses
+   (semua thread) untuk setiap pilihan filter, setelah data dan agregat sudah
+   ada di cache. Untuk matplotlib diukur dua kondisi: cache gambar kosong
+   (rentang tanggal dipersempit satu hari agar pre-render tidak dipakai dan
+   ``figure_cache`` dikosongkan sebelum tiap rerun) dan cache gambar hangat.
+   vega diukur dengan rentang tanggal yang sama dengan kondisi cache kosong.
+
+::
+
+    python benchmarks/bench_backends.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(REPO_DIR, "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+
+PAGES = {"Pertanyaan 1": ["All Season", "Spring", "Summer", "Fall", "Winter"],
+         "Pertanyaan 2": ["Semua Pengguna", "Kasual", "Terdaftar"]}
+
+CHILD = r"""
+import datetime, json, resource, sys
+sys.path.insert(0, {dashboard_dir!r})
+from streamlit.testing.v1 import AppTest
+import figure_cache
+
+def cpu():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+at = AppTest.from_file({script!r}, default_timeout=600)
+at.session_state["pilihan"] = {page!r}
+at.run()
+if {narrow!r}:
+    first, last = at.sidebar.date_input[0].value
+    at.sidebar.date_input[0].set_value((first + datetime.timedelta(days=1), last))
+    at.run()
+runs = []
+for _ in range({repeat!r}):
+    for option in {options!r}:
+        if {cold!r}:
+            figure_cache.figure_cache.clear()
+        at.selectbox[1].set_value(option)
+        start = cpu()
+        at.run()
+        runs.append(cpu() - start)
+errors = [e.value for e in at.exception] + [e.value for e in at.error]
+print(json.dumps({{"cpu": runs, "errors": errors}}))
+"""
+
+
+def chart_costs(repeat):
+    """``{variant: {backend: (CPU detik median, byte)}}`` untuk semua varian grafik."""
+    from chart_jobs import all_charts
+    from charts import import_plotting
+    from figure_cache import rasterize
+
+    import_plotting()
+    outputs = {"matplotlib": lambda build, table: rasterize(build(table)),
+               "vega": lambda build, table: json.dumps(build(table)).encode("utf-8")}
+    result = {}
+    for backend, output in outputs.items():
+        for name, (key, data, build) in all_charts(backend=backend).items():
+            table = data()
+            times = []
+            for _ in range(repeat):
+                start = time.process_time()
+                payload = output(build, table)
+                times.append(time.process_time() - start)
+            result.setdefault(name, {})[backend] = (statistics.median(times), len(payload))
+    return result
+
+
+def page_cpu(page, backend, cold, repeat):
+    """CPU median (detik) per rerun halaman ``page`` dengan backend ``backend``."""
+    code = CHILD.format(dashboard_dir=DASHBOARD_DIR, script=os.path.join(DASHBOARD_DIR, "dashboard.py"), page=page,
+                        options=PAGES[page], repeat=repeat, cold=cold, narrow=cold or backend == "vega")
+    env = dict(os.environ, DASHBOARD_CHART_BACKEND=backend)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    if result["errors"]:
+        raise RuntimeError(f"{page} ({backend}): {result['errors']}")
+    return statistics.median(result["cpu"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-pages", action="store_true", help="lewati pengukuran per rerun halaman")
+    args = parser.parse_args(argv)
+
+    print(f"{'grafik':<32}{'matplotlib':>12}{'PNG':>10}{'vega':>10}{'JSON':>10}")
+    totals = {"matplotlib": 0.0, "vega": 0.0}
+    for name, costs in chart_costs(args.repeat).items():
+        (mpl_cpu, png), (vega_cpu, spec) = costs["matplotlib"], costs["vega"]
+        totals["matplotlib"] += mpl_cpu
+        totals["vega"] += vega_cpu
+        print(f"{name:<32}{mpl_cpu * 1000:>9.1f} ms{png / 1024:>7.0f} KB{vega_cpu * 1000:>7.1f} ms{spec / 1024:>7.1f} KB")
+    print(f"{'total':<32}{totals['matplotlib'] * 1000:>9.1f} ms{'':>10}{totals['vega'] * 1000:>7.1f} ms")
+
+    if args.no_pages:
+        return
+    print()
+    print(f"{'CPU per rerun':<16}{'matplotlib (cache kosong)':>28}{'matplotlib (cache hangat)':>28}{'vega':>10}")
+    for page in PAGES:
+        cold = page_cpu(page, "matplotlib", True, args.repeat)
+        warm = page_cpu(page, "matplotlib", False, args.repeat)
+        vega = page_cpu(page, "vega", False, args.repeat)
+        print(f"{page:<16}{cold * 1000:>25.0f} ms{warm * 1000:>25.0f} ms{vega * 1000:>7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
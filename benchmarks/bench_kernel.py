@@ -0,0 +1,116 @@
+"""Kernel bincount (group_kernel.py) vs pandas groupby untuk agregat dashboard.
+
+Data sintetis sama dengan bench_scale.py (kelipatan 17.379 baris). Setiap
+agregat dihitung dengan pandas dan dengan kernel, hasilnya dibandingkan dengan
+``assert_frame_equal`` (harus identik), lalu waktunya diukur:
+
+- cube hari/jam dari baris (``build_cube``), termasuk dari kolom memory-mapped
+- total dan rata-rata per musim (bar chart, line chart), matriks musim x hari
+  (heatmap), rata-rata per jam (line/bar chart halaman 2), masing-masing dari
+  baris mentah dan dari cube
+
+::
+
+    python benchmarks/bench_kernel.py [--multiples 1,10,100] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from pandas.testing import assert_frame_equal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_scale import DASHBOARD_DIR, RESULTS_DIR, write_synthetic  # noqa: E402
+
+sys.path.insert(0, DASHBOARD_DIR)
+
+
+def pandas_cube(df, dimensions, measures):
+    # build_cube sebelum kernel
+    df = df.astype({measure: "int64" for measure in measures})
+    cube = df.groupby(dimensions, observed=True, sort=True)[measures].agg(["sum", "count", "min", "max"])
+    cube.columns = [f"{measure}_{agg}" for measure, agg in cube.columns]
+    return cube.reset_index()
+
+
+def pandas_sum(df, dimensions, columns):
+    return df.groupby(dimensions if len(dimensions) > 1 else dimensions[0])[columns].sum()
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def cases(path, column_dir):
+    """``[(nama, fungsi pandas, fungsi kernel)]``; hasil keduanya harus identik."""
+    from data_model import read_day_table, read_hour_table
+    from group_kernel import aggregate, open_columns, sum_by, write_columns
+    from rollup import DAY_DIMENSIONS, DAY_MEASURES, HOUR_DIMENSIONS, HOUR_MEASURES
+
+    day = read_day_table(path)[DAY_DIMENSIONS + DAY_MEASURES]
+    hour = read_hour_table(path)[HOUR_DIMENSIONS + HOUR_MEASURES]
+    write_columns(hour, column_dir)
+    hour_columns = open_columns(column_dir, HOUR_DIMENSIONS + HOUR_MEASURES)
+    day_cube = pandas_cube(day, DAY_DIMENSIONS, DAY_MEASURES)
+    hour_cube = pandas_cube(hour, HOUR_DIMENSIONS, HOUR_MEASURES)
+    day_cells = ["total_rentals_sum", "total_rentals_count"]
+    hour_cells = [f"{measure}_{agg}" for agg in ("sum", "count") for measure in HOUR_MEASURES]
+
+    def grouped(df, dimensions, measures):
+        # Kernel sum+count dari baris mentah, bentuk sama dengan groupby().agg(["sum", "count"])
+        return aggregate(df, dimensions, measures, ["sum", "count"]).set_index(dimensions)
+
+    def pandas_grouped(df, dimensions, measures):
+        cube = df.astype({m: "int64" for m in measures}).groupby(dimensions)[measures].agg(["sum", "count"])
+        cube.columns = [f"{measure}_{agg}" for measure, agg in cube.columns]
+        return cube
+
+    return [
+        ("cube.hari", lambda: pandas_cube(day, DAY_DIMENSIONS, DAY_MEASURES),
+         lambda: aggregate(day, DAY_DIMENSIONS, DAY_MEASURES)),
+        ("cube.jam", lambda: pandas_cube(hour, HOUR_DIMENSIONS, HOUR_MEASURES),
+         lambda: aggregate(hour, HOUR_DIMENSIONS, HOUR_MEASURES)),
+        ("cube.jam (mmap)", lambda: pandas_cube(hour, HOUR_DIMENSIONS, HOUR_MEASURES),
+         lambda: aggregate(hour_columns, HOUR_DIMENSIONS, HOUR_MEASURES)),
+        ("baris.musim (bar/line)", lambda: pandas_grouped(day, ["season"], DAY_MEASURES),
+         lambda: grouped(day, ["season"], DAY_MEASURES)),
+        ("baris.musim x hari (heatmap)", lambda: pandas_grouped(day, ["season", "weekday"], DAY_MEASURES),
+         lambda: grouped(day, ["season", "weekday"], DAY_MEASURES)),
+        ("baris.jam (halaman 2)", lambda: pandas_grouped(hour, ["HOUR_hr"], HOUR_MEASURES),
+         lambda: grouped(hour, ["HOUR_hr"], HOUR_MEASURES)),
+        ("cube.musim (bar/line)", lambda: pandas_sum(day_cube, ["season"], day_cells),
+         lambda: sum_by(day_cube, ["season"], day_cells)),
+        ("cube.musim x hari (heatmap)", lambda: pandas_sum(day_cube, ["season", "weekday"], day_cells),
+         lambda: sum_by(day_cube, ["season", "weekday"], day_cells)),
+        ("cube.jam (halaman 2)", lambda: pandas_sum(hour_cube, ["HOUR_hr"], hour_cells),
+         lambda: sum_by(hour_cube, ["HOUR_hr"], hour_cells)),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--multiples", default="1,10", help="kelipatan 17.379 baris, dipisah koma (mis. 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--data-dir", default=os.path.join(RESULTS_DIR, "data"), help="folder data sintetis (dipakai ulang)")
+    args = parser.parse_args(argv)
+
+    print(f"{'':<6}{'agregat':<32}{'pandas':>12}{'bincount':>12}{'speedup':>10}")
+    for multiple in [int(m) for m in args.multiples.split(",")]:
+        path = write_synthetic(multiple, args.data_dir)
+        with tempfile.TemporaryDirectory() as column_dir:
+            for name, with_pandas, with_kernel in cases(path, column_dir):
+                assert_frame_equal(with_kernel(), with_pandas())
+                slow, fast = timed(with_pandas, args.repeat), timed(with_kernel, args.repeat)
+                print(f"x{multiple:<5}{name:<32}{slow * 1000:>9.2f} ms{fast * 1000:>9.2f} ms{slow / fast:>9.1f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Perbandingan waktu: alur notebook vs dashboard/pipeline.py (cold & warm).
+
+Alur notebook disalin apa adanya (kuantil per kolom, ``apply`` per baris untuk
+``season_new``, merge, to_csv). Pipeline diukur tiga kali dengan folder cache
+sementara: cold (cache kosong), warm (semua stage dari cache) dan setelah
+parameter pemangkasan berubah (hanya stage clip ke bawah yang dijalankan).
+Semua keluaran diperiksa identik byte-per-byte dengan keluaran notebook.
+
+    python benchmarks/bench_pipeline.py [--repeat 3]
+"""
+import argparse
+import filecmp
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard")
+sys.path.insert(0, DASHBOARD_DIR)
+
+import pipeline  # noqa: E402
+
+
+def notebook_flow(out):
+    """Sel-sel notebook.ipynb yang menghasilkan all_data.csv."""
+    day_df = pd.read_csv(pipeline.DAY_SOURCE)
+    hour_df = pd.read_csv(pipeline.HOUR_SOURCE)
+    day_df["dteday"] = pd.to_datetime(day_df["dteday"])
+    hour_df["dteday"] = pd.to_datetime(hour_df["dteday"])
+    for col in ["windspeed", "casual"]:
+        Q1 = hour_df[col].quantile(0.25)
+        Q3 = hour_df[col].quantile(0.75)
+        IQR = Q3 - Q1
+        maximum = Q3 + (1.5 * IQR)
+        hour_df[f"{col}_replaced_upper"] = hour_df[col].clip(upper=maximum)
+    day_df.rename(columns={"cnt": "total_rentals"}, inplace=True)
+    day_df["season_new"] = day_df["season"].apply(lambda x: {1: "Spring", 2: "Summer", 3: "Fall", 4: "Winter"}[x])
+    day_df = day_df.add_prefix("DAY_")
+    hour_df = hour_df.add_prefix("HOUR_").rename(columns={"HOUR_dteday": "dteday"})
+    all_df = pd.merge(day_df, hour_df, left_on="DAY_dteday", right_on="dteday", how="outer")
+    all_df.to_csv(out, index=False)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {"notebook": [], "pipeline cold": [], "pipeline warm": [], "clip berubah": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = os.path.join(tmp, "notebook.csv")
+        out = os.path.join(tmp, "all_data.csv")
+        for i in range(args.repeat):
+            cache_dir = os.path.join(tmp, f"cache{i}")
+            results["notebook"].append(timed(lambda: notebook_flow(expected)))
+            results["pipeline cold"].append(timed(lambda: pipeline.run(out, cache_dir=cache_dir)))
+            assert filecmp.cmp(expected, out, shallow=False), "keluaran pipeline berbeda dengan notebook"
+            results["pipeline warm"].append(timed(lambda: pipeline.run(out, cache_dir=cache_dir)))
+            assert filecmp.cmp(expected, out, shallow=False)
+            results["clip berubah"].append(timed(lambda: pipeline.run(out, columns=["casual"], cache_dir=cache_dir)))
+            # Kembalikan ke parameter default: stage sampai join diambil dari cache, hanya export
+            pipeline.run(out, cache_dir=cache_dir)
+            assert filecmp.cmp(expected, out, shallow=False)
+
+    base = statistics.median(results["notebook"])
+    print(f"{'skenario':<16}{'median (ms)':>12}{'vs notebook':>13}")
+    for name, times in results.items():
+        median = statistics.median(times)
+        print(f"{name:<16}{median * 1000:>12.0f}{base / median:>12.1f}x")
+    print("Keluaran pipeline identik byte-per-byte dengan alur notebook.")
+
+
+if __name__ == "__main__":
+    main()
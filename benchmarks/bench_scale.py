@@ -0,0 +1,284 @@
+"""Benchmark per tahap dashboard pada data sintetis 1x, 10x, 100x ... all_data.csv.
+
+Data sintetis berskema all_data.csv dibuat dengan menyalin 17.379 baris asli
+sebanyak ``multiple`` kali: tanggal digeser 105 minggu per salinan (hari dalam
+seminggu dan musim tetap), ``instant``/``yr`` dilanjutkan, dan jumlah penyewaan
+diberi derau acak (seed tetap). Setiap tahap diukur terpisah:
+
+- load      : ``pd.read_csv`` mentah dan ``data_loader.read_all_data``
+- convert   : ``pd.to_datetime``, loop pembersihan numerik lama, ``apply_schema``
+- filter    : ``filter_by_season`` (mask lama dan indeks seleksi), ``filter_by_user_type``
+- aggregate : rollup cube hari dan jam
+- chart     : setiap fungsi ``create_*`` (termasuk rasterisasi PNG)
+- page      : satu run headless dashboard.py per halaman di proses baru (cold)
+
+Waktu = median ``--repeat`` kali; memori puncak = tracemalloc (tahap in-process)
+atau RSS maksimum proses anak (tahap page). Hasil disimpan sebagai JSON dan
+dibandingkan dengan baseline; tahap yang lebih lambat/boros dari ``--threshold``
+ditandai REGRESI dan exit code menjadi 1::
+
+    python benchmarks/bench_scale.py --multiples 1,10 --save-baseline
+    python benchmarks/bench_scale.py --multiples 1,10
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(REPO_DIR, "dashboard")
+RESULTS_DIR = os.path.join(REPO_DIR, "benchmarks", "results")
+BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+sys.path.insert(0, DASHBOARD_DIR)
+
+BASE_ROWS = 17379
+# 105 minggu > 731 hari: salinan tidak tumpang tindih, hari dalam seminggu tetap
+SHIFT_DAYS = 7 * 105
+SEED = 2011
+# Perubahan di bawah ambang ini dianggap derau pengukuran
+MIN_SECONDS = 0.005
+MIN_MB = 1.0
+PAGES = ["Pertanyaan 1", "Pertanyaan 2"]
+
+CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({script!r}, default_timeout=600)
+at.session_state["pilihan"] = {page!r}
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+errors = [e.value for e in at.exception] + [e.value for e in at.error]
+print(json.dumps({{"seconds": elapsed, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, "errors": errors}}))
+"""
+
+
+# --- Data sintetis -----------------------------------------------------------
+
+def synthetic_path(multiple, data_dir):
+    return os.path.join(data_dir, f"all_data_x{multiple}.csv")
+
+
+def write_synthetic(multiple, data_dir, source=None):
+    """Menulis all_data sintetis ``multiple`` x 17.379 baris (dilewati bila sudah ada)."""
+    path = synthetic_path(multiple, data_dir)
+    if os.path.exists(path):
+        return path
+    base = pd.read_csv(source or os.path.join(DASHBOARD_DIR, "all_data.csv"))
+    days = {col: pd.to_datetime(base[col]) for col in ("DAY_dteday", "dteday")}
+    rng = np.random.default_rng(SEED)
+    os.makedirs(data_dir, exist_ok=True)
+    tmp = path + ".tmp"
+    for copy in range(multiple):
+        part = base.copy()
+        for col, dates in days.items():
+            part[col] = (dates + pd.Timedelta(days=SHIFT_DAYS * copy)).dt.strftime("%Y-%m-%d")
+        for col in ("DAY_instant", "HOUR_instant"):
+            part[col] += copy * len(base)
+        for col in ("DAY_yr", "HOUR_yr"):
+            part[col] += 2 * copy
+        if copy:
+            noise = rng.uniform(0.8, 1.2, size=(len(part), 2))
+            part["HOUR_casual"] = (part["HOUR_casual"] * noise[:, 0]).round().astype("int64")
+            part["HOUR_registered"] = (part["HOUR_registered"] * noise[:, 1]).round().astype("int64")
+            part["HOUR_cnt"] = part["HOUR_casual"] + part["HOUR_registered"]
+            part["HOUR_casual_replaced_upper"] = part["HOUR_casual"].clip(upper=114)
+            factor = rng.uniform(0.9, 1.1)
+            for col in ("DAY_casual", "DAY_registered", "DAY_total_rentals"):
+                part[col] = (part[col] * factor).round().astype("int64")
+        part.to_csv(tmp, mode="a" if copy else "w", header=not copy, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+# --- Tahap yang diukur -------------------------------------------------------
+
+def legacy_to_datetime(df):
+    # Konversi tanggal dashboard.py lama (tanpa format)
+    return pd.to_datetime(df["DAY_dteday"]), pd.to_datetime(df["dteday"])
+
+
+def legacy_cleanup(df):
+    # Loop pembersihan numerik dashboard.py lama
+    df = df[["HOUR_casual_replaced_upper", "HOUR_registered", "HOUR_hr"]].copy()
+    for col in ["HOUR_casual_replaced_upper", "HOUR_registered", "HOUR_hr"]:
+        df[col] = df[col].astype(str).str.strip()
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    return df
+
+
+def stages(path):
+    """``[(nama, fungsi tanpa argumen)]`` untuk satu file data; masukan disiapkan di sini."""
+    from chart_jobs import SEASON_OPTIONS, USER_TYPES, all_charts, filter_by_user_type
+    from charts import import_plotting
+    from data_loader import read_all_data
+    from data_model import read_day_table, read_hour_table
+    from figure_cache import rasterize
+    from quantiles import month_cells
+    from rollup import DAY_DIMENSIONS, DAY_MEASURES, HOUR_DIMENSIONS, HOUR_MEASURES, build_cube
+    from schema import apply_schema
+    from selection_index import DAY_INDEX_COLUMNS, DayIndex
+
+    raw = pd.read_csv(path)
+    typed = read_all_data(path)
+    day_table = read_day_table(path)
+    hour_table = read_hour_table(path)
+    day_index = DayIndex(day_table[DAY_INDEX_COLUMNS])
+    import_plotting()
+
+    result = [
+        ("load.read_csv", lambda: pd.read_csv(path)),
+        ("load.read_all_data", lambda: read_all_data(path)),
+        ("convert.to_datetime", lambda: legacy_to_datetime(raw)),
+        ("convert.cleanup_loop", lambda: legacy_cleanup(raw)),
+        ("convert.apply_schema", lambda: apply_schema(raw)),
+        ("filter.season_mask", lambda: [typed if season == "All Season" else typed[typed["season_new"] == season]
+                                        for season in SEASON_OPTIONS]),
+        ("filter.season_index", lambda: [day_index.filter_days(season) for season in SEASON_OPTIONS]),
+        ("filter.user_type", lambda: [filter_by_user_type(typed, user_type) for user_type in USER_TYPES]),
+        ("aggregate.day_cube", lambda: build_cube(day_table, DAY_DIMENSIONS, DAY_MEASURES)),
+        ("aggregate.hour_cube", lambda: build_cube(hour_table, HOUR_DIMENSIONS, HOUR_MEASURES)),
+        ("aggregate.month_quantiles", lambda: month_cells(day_table)),
+    ]
+    charts = all_charts(path)
+    for name, variant in [("create_bar_chart", "bar_chart-All_Season"), ("create_box_plot", "box_plot-All_Season"),
+                          ("create_line_chart", "line_chart-All_Season"), ("create_heatmap", "heatmap-All_Season"),
+                          ("create_line_chart_2", "line_chart_2-Semua_Pengguna"),
+                          ("create_bar_chart_2", "bar_chart_2-Semua_Pengguna"), ("create_pie_chart_2", "pie_chart_2")]:
+        key, data, build = charts[variant]
+        table = data()
+        result.append((f"chart.{name}", lambda build=build, table=table: rasterize(build(table))))
+    return result
+
+
+def measure(fn, repeat):
+    """(median detik, memori puncak MB); memori diukur di run terpisah agar tracemalloc tidak memengaruhi waktu."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), peak / 1e6
+
+
+def measure_page(path, page, repeat):
+    code = CHILD.format(dashboard_dir=DASHBOARD_DIR, script=os.path.join(DASHBOARD_DIR, "dashboard.py"), page=page)
+    env = dict(os.environ, DASHBOARD_DATA_PATH=path)
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True, env=env).stdout
+        run = json.loads(out.strip().splitlines()[-1])
+        if run["errors"]:
+            raise RuntimeError(f"{page} ({path}): {run['errors']}")
+        runs.append(run)
+    return statistics.median(r["seconds"] for r in runs), max(r["rss_mb"] for r in runs)
+
+
+def run_suite(multiples, repeat, data_dir, pages=True):
+    from data_loader import clear_cache
+
+    results = {}
+    for multiple in multiples:
+        path = write_synthetic(multiple, data_dir)
+        rows = {}
+        for name, fn in stages(path):
+            seconds, peak = measure(fn, repeat)
+            rows[name] = {"seconds": seconds, "peak_mb": peak}
+            print(f"  x{multiple:<5}{name:<30}{seconds * 1000:>10.1f} ms{peak:>10.1f} MB", flush=True)
+        clear_cache()
+        if pages:
+            for page in PAGES:
+                seconds, rss = measure_page(path, page, repeat)
+                rows[f"page.{page}"] = {"seconds": seconds, "peak_mb": rss}
+                print(f"  x{multiple:<5}{'page.' + page:<30}{seconds * 1000:>10.1f} ms{rss:>10.1f} MB", flush=True)
+        results[f"x{multiple}"] = {"rows": BASE_ROWS * multiple, "stages": rows}
+    return results
+
+
+# --- Baseline ----------------------------------------------------------------
+
+def compare(results, baseline, threshold):
+    """Daftar regresi ``(ukuran, tahap, metrik, baseline, sekarang)`` terhadap baseline."""
+    regressions = []
+    for size, current in results.items():
+        base = baseline.get("results", {}).get(size, {}).get("stages", {})
+        for stage, values in current["stages"].items():
+            if stage not in base:
+                continue
+            for metric, floor in (("seconds", MIN_SECONDS), ("peak_mb", MIN_MB)):
+                old, new = base[stage][metric], values[metric]
+                if new > old * (1 + threshold) and new - old > floor:
+                    regressions.append((size, stage, metric, old, new))
+    return regressions
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--multiples", default="1,10", help="kelipatan 17.379 baris, dipisah koma (mis. 1,10,100)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--data-dir", default=os.path.join(RESULTS_DIR, "data"), help="folder data sintetis (dipakai ulang)")
+    parser.add_argument("--json", help="berkas hasil (default benchmarks/results/bench_scale-<waktu>.json)")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="simpan hasil ini sebagai baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="kenaikan relatif yang dianggap regresi (default 0.2)")
+    parser.add_argument("--no-pages", action="store_true", help="lewati run headless dashboard.py")
+    args = parser.parse_args(argv)
+
+    multiples = [int(m) for m in args.multiples.split(",")]
+    results = run_suite(multiples, args.repeat, args.data_dir, pages=not args.no_pages)
+    import matplotlib
+    payload = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+                    "pandas": pd.__version__, "numpy": np.__version__, "matplotlib": matplotlib.__version__},
+        "repeat": args.repeat,
+        "results": results,
+    }
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    out = args.json or os.path.join(RESULTS_DIR, f"bench_scale-{stamp}.json")
+    write_json(out, payload)
+    print(f"\nHasil: {out}")
+
+    if args.save_baseline:
+        write_json(args.baseline, payload)
+        print(f"Baseline disimpan: {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Belum ada baseline (jalankan dengan --save-baseline).")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(results, json.load(f), args.threshold)
+    for size, stage, metric, old, new in regressions:
+        unit = "ms" if metric == "seconds" else "MB"
+        scale = 1000 if metric == "seconds" else 1
+        print(f"REGRESI {size} {stage} {metric}: {old * scale:.1f} -> {new * scale:.1f} {unit} ({new / old - 1:+.0%})")
+    if not regressions:
+        print(f"Tidak ada regresi terhadap baseline (ambang {args.threshold:.0%}).")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Perbandingan cold start dan memori: CSV vs snapshot Feather.
+
+Setiap skenario dijalankan di proses Python baru agar waktu dan memori
+(RSS maksimum) yang terukur adalah kondisi cold start yang sebenarnya.
+
+    python benchmarks/bench_snapshot.py [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+DASHBOARD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard")
+
+PAGE_COLUMNS = {
+    "semua kolom": None,
+    "halaman 1": ["season_new", "total_rentals", "DAY_dteday"],
+    "halaman 2": ["HOUR_hr", "HOUR_casual_replaced_upper", "HOUR_registered"],
+}
+
+# Kode yang dijalankan di proses anak; mencetak JSON hasil pengukuran
+CHILD = r"""
+import json, resource, sys, time
+sys.path.insert(0, {dashboard_dir!r})
+import pandas
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+import data_loader
+columns = {columns!r}
+if {mode!r} == "csv":
+    df = data_loader.read_all_data(data_loader.LOCAL_PATH, columns)
+else:
+    import snapshot
+    df = snapshot.read_snapshot("all_data", columns)
+elapsed = time.perf_counter() - start
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{"seconds": elapsed, "rss_mb": (rss_after - rss_before) / 1024, "rows": len(df), "cols": df.shape[1]}}))
+"""
+
+
+def run_child(mode, columns):
+    code = CHILD.format(dashboard_dir=DASHBOARD_DIR, columns=columns, mode=mode)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Pastikan snapshot sudah ada supaya yang terukur hanya pembacaan
+    sys.path.insert(0, DASHBOARD_DIR)
+    import snapshot
+    snapshot.ensure_snapshot("all_data")
+
+    print(f"{'skenario':<14}{'sumber':<10}{'waktu (ms)':>12}{'RSS (MB)':>10}")
+    for label, columns in PAGE_COLUMNS.items():
+        for mode in ("csv", "snapshot"):
+            runs = [run_child(mode, columns) for _ in range(args.repeat)]
+            seconds = statistics.median(r["seconds"] for r in runs)
+            rss = statistics.median(r["rss_mb"] for r in runs)
+            print(f"{label:<14}{mode:<10}{seconds * 1000:>12.1f}{rss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
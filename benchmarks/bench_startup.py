@@ -0,0 +1,76 @@
+"""Waktu sampai tampilan pertama (time-to-first-paint) per halaman dashboard.
+
+Setiap pengukuran menjalankan dashboard.py sekali secara headless (Streamlit
+AppTest) di proses Python baru, sehingga import modul, pemuatan data, agregasi
+dan render grafik ikut terukur seperti saat pengguna pertama membuka halaman.
+Snapshot data dibuat terlebih dahulu (putaran pemanasan yang tidak dihitung).
+
+Dengan ``--ref`` versi dashboard/ dari commit git lain ikut diukur sebagai
+pembanding:
+
+    python benchmarks/bench_startup.py --ref HEAD~1 [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["Pertanyaan 1", "Pertanyaan 2"]
+
+CHILD = r"""
+import json, os, sys, time
+script = {script!r}
+sys.path.insert(0, os.path.dirname(script))
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(script, default_timeout=300)
+at.session_state["pilihan"] = {page!r}
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "exceptions": [e.value for e in at.exception]}}))
+"""
+
+
+def time_page(script, page):
+    code = CHILD.format(script=script, page=page)
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    if result["exceptions"]:
+        raise RuntimeError(f"{script} ({page}): {result['exceptions']}")
+    return result["seconds"]
+
+
+def export_ref(ref, target):
+    """Menyalin folder dashboard/ dari commit ``ref`` ke folder sementara."""
+    archive = subprocess.run(["git", "-C", REPO_DIR, "archive", ref, "dashboard"], check=True, capture_output=True).stdout
+    subprocess.run(["tar", "-x", "-C", target], input=archive, check=True)
+    return os.path.join(target, "dashboard", "dashboard.py")
+
+
+def measure(label, script, repeat):
+    for page in PAGES:
+        time_page(script, page)  # pemanasan: membuat snapshot, cache disk OS
+        runs = [time_page(script, page) for _ in range(repeat)]
+        print(f"{label:<12}{page:<14}{statistics.median(runs) * 1000:>10.0f} ms  (min {min(runs) * 1000:.0f}, max {max(runs) * 1000:.0f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ref", help="commit git pembanding, mis. HEAD~1")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'versi':<12}{'halaman':<14}{'median':>13}")
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            measure(args.ref, export_ref(args.ref, tmp), args.repeat)
+    measure("sekarang", os.path.join(REPO_DIR, "dashboard", "dashboard.py"), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Uji beban: latensi halaman (p50/p95) untuk N sesi dashboard yang berjalan bersamaan.
+
+Setiap sesi adalah satu AppTest Streamlit di thread-nya sendiri, dalam satu
+proses yang sama seperti server Streamlit sungguhan (modul, cache data dan
+cache gambar dipakai bersama). Setiap sesi membuka halaman lalu berganti
+pilihan filter secara acak sebanyak ``--requests`` kali; waktu setiap rerun
+dicatat sebagai latensi halaman.
+
+Dengan ``--cold`` cache gambar dikosongkan sebelum setiap rerun dan pre-render
+dimatikan (``DASHBOARD_PRERENDER_DIR`` diarahkan ke folder kosong), sehingga
+yang diukur adalah render grafik (kasus terburuk), bukan pembacaan PNG dari
+``dashboard/prerendered/``. ``--workers 1,4`` menjalankan uji
+yang sama untuk beberapa ukuran pool render (DASHBOARD_RENDER_WORKERS),
+masing-masing di proses baru:
+
+    python benchmarks/load_test.py --sessions 8 --requests 10 --cold --workers 1,4
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(REPO_DIR, "dashboard", "dashboard.py")
+OPTIONS = {
+    "Pertanyaan 1": ["All Season", "Spring", "Summer", "Fall", "Winter"],
+    "Pertanyaan 2": ["Semua Pengguna", "Kasual", "Terdaftar"],
+}
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def share_test_runtime():
+    """AppTest memasang dan melepas Runtime tiruan global pada setiap run, sehingga
+    beberapa AppTest yang berjalan bersamaan saling menghapus Runtime. Di sini
+    semua sesi memakai satu Runtime tiruan bersama, seperti satu server sungguhan."""
+    from unittest.mock import MagicMock
+
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    shared = MagicMock(spec=Runtime)
+    shared.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared.cache_storage_manager = MemoryCacheStorageManager()
+    Runtime.instance = classmethod(lambda cls: shared)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def session(seed, requests, cold, latencies, errors):
+    from streamlit.testing.v1 import AppTest
+
+    from figure_cache import figure_cache
+
+    rng = random.Random(seed)
+    page = rng.choice(list(OPTIONS))
+    at = AppTest.from_file(SCRIPT, default_timeout=300)
+    at.session_state["pilihan"] = page
+    for i in range(requests + 1):
+        if i:
+            # selectbox[0] = pilihan halaman, selectbox[1] = filter halaman
+            at.selectbox[1].set_value(rng.choice(OPTIONS[page]))
+        if cold:
+            figure_cache.clear()
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        errors.extend(e.value for e in list(at.exception) + list(at.error))
+        if i:  # rerun pertama (impor + pemuatan data) tidak dihitung
+            latencies.append(elapsed)
+
+
+def run(sessions, requests, cold):
+    if cold:
+        # Harus di-set sebelum prerender.py di-import oleh dashboard.py
+        os.environ["DASHBOARD_PRERENDER_DIR"] = tempfile.mkdtemp(prefix="load_test_prerender_")
+    sys.path.insert(0, os.path.dirname(SCRIPT))
+    from data_loader import load_all_data
+
+    load_all_data()  # pemanasan: snapshot dan cache data
+    share_test_runtime()
+    latencies, errors = [], []
+    threads = [threading.Thread(target=session, args=(seed, requests, cold, latencies, errors)) for seed in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    if errors:
+        raise RuntimeError(errors[:3])
+    return {
+        "requests": len(latencies),
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "mean": statistics.mean(latencies),
+        "throughput": len(latencies) / wall,
+    }
+
+
+def run_with_workers(workers, sessions, requests, cold):
+    """Menjalankan uji di proses baru dengan ukuran pool render tertentu."""
+    env = dict(os.environ, DASHBOARD_RENDER_WORKERS=str(workers))
+    argv = [sys.executable, os.path.abspath(__file__), "--sessions", str(sessions), "--requests", str(requests), "--json"]
+    if cold:
+        argv.append("--cold")
+    out = subprocess.run(argv, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def report(label, result):
+    print(f"{label:<10}{result['requests']:>8}{result['p50'] * 1000:>10.0f}{result['p95'] * 1000:>10.0f}"
+          f"{result['mean'] * 1000:>10.0f}{result['throughput']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="jumlah sesi bersamaan")
+    parser.add_argument("--requests", type=int, default=10, help="rerun per sesi")
+    parser.add_argument("--cold", action="store_true", help="kosongkan cache gambar sebelum setiap rerun, tanpa pre-render")
+    parser.add_argument("--workers", help="daftar ukuran pool render, mis. 1,4")
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.json:
+        print(json.dumps(run(args.sessions, args.requests, args.cold)))
+        return
+    print(f"{args.sessions} sesi x {args.requests} rerun{' (cache dingin)' if args.cold else ''}")
+    print(f"{'workers':<10}{'rerun':>8}{'p50 ms':>10}{'p95 ms':>10}{'rata ms':>10}{'rerun/s':>10}")
+    if args.workers:
+        for workers in args.workers.split(","):
+            report(workers, run_with_workers(int(workers), args.sessions, args.requests, args.cold))
+    else:
+        report(os.environ.get("DASHBOARD_RENDER_WORKERS", "default"), run(args.sessions, args.requests, args.cold))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Daftar grafik setiap halaman beserta data dan fungsi pembuatnya.
+
+Satu sumber untuk dashboard (render saat diminta) dan prerender.py (render
+semua varian di muka). Setiap grafik adalah ``(kunci, data, build)``:
+
+- kunci : (jenis grafik, pilihan filter), sama dengan kunci cache gambar
+- data  : fungsi tanpa argumen -> tabel agregat (DataFrame/Series) masukan grafik
+- build : fungsi tabel -> Figure (charts.py) atau spesifikasi Vega-Lite
+  (vega_charts.py), tergantung ``backend``
+"""
+from charts import create_bar_chart, create_bar_chart_2, create_box_plot, create_heatmap, create_line_chart, create_line_chart_2, create_pie_chart_2
+from data_loader import LOCAL_PATH
+from metrics import instrument
+from quantiles import box_stats_frame, load_season_quantiles, season_summaries
+from rollup import hourly_means, load_day_cube, load_hour_cube, measure_totals, season_means, season_totals, season_weekday_means, slice_season
+from vega_charts import vega_bar_chart, vega_bar_chart_2, vega_box_plot, vega_heatmap, vega_line_chart, vega_line_chart_2, vega_pie_chart_2
+
+
+SEASON_OPTIONS = ["All Season", "Spring", "Summer", "Fall", "Winter"]
+USER_TYPES = ["Semua Pengguna", "Kasual", "Terdaftar"]
+# Fungsi pembuat grafik per backend (argumen sama): "matplotlib" -> Figure (PNG
+# dari server), "vega" -> spesifikasi Vega-Lite yang digambar di browser
+BUILDERS = {
+    "matplotlib": {"bar_chart": create_bar_chart, "box_plot": create_box_plot, "line_chart": create_line_chart,
+                   "heatmap": create_heatmap, "line_chart_2": create_line_chart_2, "bar_chart_2": create_bar_chart_2,
+                   "pie_chart_2": create_pie_chart_2},
+    "vega": {"bar_chart": vega_bar_chart, "box_plot": vega_box_plot, "line_chart": vega_line_chart,
+             "heatmap": vega_heatmap, "line_chart_2": vega_line_chart_2, "bar_chart_2": vega_bar_chart_2,
+             "pie_chart_2": vega_pie_chart_2},
+}
+
+
+# Fungsi untuk memfilter data berdasarkan jenis pengguna
+@instrument("filter.user_type")
+def filter_by_user_type(df, user_type):
+    if user_type == "Semua Pengguna":
+        return df
+    elif user_type == "Kasual":
+        return df[['HOUR_hr', 'HOUR_casual_replaced_upper']] # Hanya kolom kasual
+    elif user_type == "Terdaftar":
+        return df[['HOUR_hr', 'HOUR_registered']]  # Hanya kolom terdaftar
+    else:
+        return df # Handle kasus jika ada input yang tidak valid
+
+
+def season_charts(selected_season, season_cube, summaries, weekday_means, backend="matplotlib"):
+    """Grafik halaman 1. ``summaries``/``weekday_means``: fungsi -> ``{musim: QuantileSummary}`` / matriks musim x hari."""
+    build = BUILDERS[backend]
+    return {
+        'bar_chart': (('bar_chart', selected_season), lambda: season_totals(season_cube).reset_index(),
+                      lambda df: build['bar_chart'](df, 'season_new', 'total_rentals', f'Bar Chart Total Penyewaan per Musim ({selected_season})')),
+        'box_plot': (('box_plot', selected_season), lambda: box_stats_frame(summaries()),
+                     lambda df: build['box_plot'](df, 'season_new', 'total_rentals', f'Box Plot Total Penyewaan per Musim ({selected_season})')),
+        'line_chart': (('line_chart', selected_season), lambda: season_means(season_cube).reset_index(),
+                       lambda df: build['line_chart'](df, 'season_new', 'total_rentals', f'Line Chart Rata-rata Penyewaan per Musim ({selected_season})')),
+        'heatmap': (('heatmap', selected_season), weekday_means, build['heatmap']),
+    }
+
+
+def user_type_charts(user_type, hour_cube, backend="matplotlib"):
+    """Grafik halaman 2 untuk satu jenis pengguna (pie chart sama untuk semua jenis)."""
+    build = BUILDERS[backend]
+
+    def hourly():
+        return filter_by_user_type(hourly_means(hour_cube).reset_index(), user_type)
+
+    # Argumen grafik per jenis pengguna: (kolom x, kolom y, judul)
+    if user_type == "Kasual":
+        line_args = ('HOUR_casual_replaced_upper', 'HOUR_casual_replaced_upper', 'Line Chart Rata-rata Penyewaan Pengguna Kasual per Jam')
+        bar_args = ('HOUR_hr', 'HOUR_casual_replaced_upper', 'Bar Chart Rata-rata Penyewaan Pengguna Kasual per Jam')
+    elif user_type == "Terdaftar":
+        line_args = ('HOUR_registered', 'HOUR_registered', 'Line Chart Rata-rata Penyewaan Pengguna Terdaftar per Jam ')
+        bar_args = ('HOUR_hr', 'HOUR_registered', 'Bar Chart Rata-rata Penyewaan Pengguna Terdaftar per Jam')
+    else:
+        line_args = ('HOUR_casual_replaced_upper', 'HOUR_registered', 'Line Chart Rata-rata Penyewaan Pengguna Kasual & Terdaftar per Jam')
+        bar_args = ('HOUR_hr', ['HOUR_casual_replaced_upper', 'HOUR_registered'], 'Bar Chart Rata-rata Penyewaan Pengguna Kasual & Terdaftar per Jam')
+
+    return {
+        'line_chart_2': (('line_chart_2', user_type), hourly, lambda df: build['line_chart_2'](df, *line_args, user_type)),
+        'bar_chart_2': (('bar_chart_2', user_type), hourly, lambda df: build['bar_chart_2'](df, *bar_args, user_type)),
+        'pie_chart_2': (('pie_chart_2',), lambda: measure_totals(hour_cube),
+                        lambda totals: build['pie_chart_2'](totals, 'HOUR_hr', ['HOUR_casual_replaced_upper', 'HOUR_registered'], 'Proporsi Penyewaan Sepeda Antara Pengguna Kasual & Terdaftar per Jam')),
+    }
+
+
+def renderers(charts, key_suffix=()):
+    """``{nama: (kunci, data, build)}`` -> ``{nama: (kunci + suffix, render)}`` untuk render_many."""
+    return {name: (key + key_suffix, lambda data=data, build=build: build(data()))
+            for name, (key, data, build) in charts.items()}
+
+
+def variant_id(key):
+    """Nama berkas aman untuk satu kunci grafik, mis. ``bar_chart-All_Season``."""
+    return "-".join(str(part).replace(" ", "_") for part in key)
+
+
+def all_charts(path=LOCAL_PATH, backend="matplotlib"):
+    """Semua varian grafik tanpa filter tanggal: ``{variant_id: (kunci, data, build)}``."""
+    day_cube = load_day_cube(path)
+    hour_cube = load_hour_cube(path)
+    season_quantiles = load_season_quantiles(path)
+    charts = {}
+    for season in SEASON_OPTIONS:
+        season_cube = slice_season(day_cube, season)
+        page = season_charts(season, season_cube,
+                             lambda season=season: season_summaries(season_quantiles, season),
+                             lambda season_cube=season_cube: season_weekday_means(season_cube), backend)
+        charts.update({variant_id(chart[0]): chart for chart in page.values()})
+    for user_type in USER_TYPES:
+        page = user_type_charts(user_type, hour_cube, backend)
+        charts.update({variant_id(chart[0]): chart for chart in page.values()})
+    return charts
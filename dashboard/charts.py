@@ -0,0 +1,207 @@
+"""Pembuat grafik dashboard (matplotlib/seaborn) yang aman dipakai banyak thread.
+
+Streamlit menjalankan setiap sesi di thread-nya sendiri, sedangkan state
+machine pyplot (``plt.figure``, ``plt.title``, ``plt.tight_layout``) bersifat
+global. Semua grafik di sini dibuat langsung lewat API berorientasi objek
+``matplotlib.figure.Figure`` (tidak terdaftar di pyplot, dirender dengan
+canvas Agg non-interaktif), sehingga beberapa grafik bisa dirender paralel.
+
+Fungsi ``create_*`` tidak memanggil Streamlit: kesalahan dilempar sebagai
+exception dan ditampilkan oleh halaman. matplotlib/seaborn baru di-import
+saat sebuah grafik benar-benar digambar.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from metrics import instrument
+
+
+_import_lock = threading.Lock()
+
+
+def import_plotting():
+    """Meng-import matplotlib/seaborn sekali saja. Impor pertama yang terjadi
+    bersamaan dari beberapa thread render bisa gagal dengan modul yang baru
+    setengah ter-inisialisasi, jadi diserialkan dengan lock."""
+    with _import_lock:
+        import matplotlib.backends.backend_agg  # noqa: F401
+        import matplotlib.figure  # noqa: F401
+        import matplotlib.ticker  # noqa: F401
+        import seaborn  # noqa: F401
+
+
+def new_figure(figsize):
+    """Figure + satu Axes tanpa pyplot (canvas Agg, tidak ada state global)."""
+    import_plotting()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+# Format sumbu: ribuan -> K, jutaan -> J
+def format_angka(x, pos):
+    if x >= 1000000:
+        return '%1.0fJ' % (x * 1e-6)
+    elif x >= 1000:
+        return '%1.0fK' % (x * 1e-3)
+    else:
+        return '%1.0f' % x
+
+
+### AREA LOAD DATA 1
+# Grafik halaman 1 (kecuali box plot) menerima agregat per musim hasil irisan
+# rollup cube (lihat rollup.py), bukan baris mentah.
+# 1. Membuat Bar Chart 
+@instrument("chart.create_bar_chart")
+def create_bar_chart(df, x_col, y_col, title):
+    import_plotting()
+    import matplotlib.ticker as ticker
+
+    fig, ax = new_figure(figsize=(8, 6))
+    ax.bar(df[x_col].astype(str), df[y_col])
+    ax.set_title(title)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel('Total Jumlah ' + y_col)
+    ax.yaxis.set_major_formatter(ticker.FuncFormatter(format_angka))
+    fig.tight_layout()
+    return fig
+
+
+# 2. Membuat Box Plot dari tabel statistik per musim (quantiles.box_stats_frame),
+# bukan dari baris mentah; gaya sama dengan sns.boxplot bawaan
+@instrument("chart.create_box_plot")
+def create_box_plot(stats_df, x_col, y_col, title):
+    import_plotting()
+    from colorsys import rgb_to_hls
+    from matplotlib.colors import to_rgb
+    from seaborn.utils import desaturate
+
+    fig, ax = new_figure(figsize=(8, 6))
+    positions = np.arange(len(stats_df))
+    color = desaturate("C0", 0.75)
+    lum = rgb_to_hls(*to_rgb(color))[1] * 0.6
+    line = (lum, lum, lum)
+    ax.bxp(stats_df.to_dict("records"), positions=positions, widths=0.8, capwidths=0.4, patch_artist=True, manage_ticks=False,
+           boxprops={"facecolor": color, "edgecolor": line}, medianprops={"color": line, "solid_capstyle": "butt"},
+           whiskerprops={"color": line, "solid_capstyle": "butt"}, flierprops={"markeredgecolor": line},
+           capprops={"color": line})
+    ax.set_xticks(positions, stats_df["label"].astype(str))
+    ax.xaxis.grid(False)
+    ax.set_xlim(-.5, len(stats_df) - .5)
+    ax.set_title(title)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel('Jumlah ' + y_col)
+    fig.tight_layout()
+    return fig
+
+
+# 3. Membuat Line Chart 
+@instrument("chart.create_line_chart")
+def create_line_chart(df, x_col, y_col, title):
+    fig, ax = new_figure(figsize=(8, 6))
+    ax.plot(df[x_col].astype(str), df[y_col], marker='o')
+    ax.set_title(title)
+    ax.set_xlabel(x_col)
+    ax.set_ylabel('Rata-rata ' + y_col)
+    fig.tight_layout()
+    return fig
+
+
+# 4. Membuat heatmap (pivot_table = rata-rata musim x hari dari rollup cube)
+@instrument("chart.create_heatmap")
+def create_heatmap(pivot_table): 
+    import_plotting()
+    import seaborn as sns
+
+    fig, ax = new_figure(figsize=(8, 6))
+    sns.heatmap(pivot_table, annot=True, cmap="YlGnBu", fmt=".0f", ax=ax)
+    ax.set_title('Heatmap Rata-rata Penyewaan per Musim dan Hari dalam Seminggu')
+    ax.set_xlabel('Hari dalam Seminggu')
+    ax.set_ylabel('Musim')
+    return fig # Kembalikan objek figure
+
+
+
+## AREA LOAD DATA 2 
+# Grafik halaman 2 menerima rata-rata per jam (24 baris, kolom HOUR_hr) dari rollup cube
+# 1. Line Chart Rata-rata Penyewaan per Jam
+@instrument("chart.create_line_chart_2")
+def create_line_chart_2(df, x_col, y_col, title, user_type):
+    if df.empty:
+        raise ValueError("Tidak ada data untuk ditampilkan")
+    if pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col]):
+        hourly_avg = df.set_index('HOUR_hr')[[x_col, y_col]]
+        fig, ax = new_figure(figsize=(12, 8))
+        if user_type == "Semua Pengguna":
+            ax.plot(hourly_avg.index, hourly_avg['HOUR_casual_replaced_upper'], label='Kasual', marker='o', color='lightcoral')
+            ax.plot(hourly_avg.index, hourly_avg['HOUR_registered'], label='Terdaftar', marker='o', color='lightskyblue')
+        elif user_type == "Kasual":
+            ax.plot(hourly_avg.index, hourly_avg[y_col], label='Kasual', marker='o', color='lightcoral')
+        elif user_type == "Terdaftar":
+            ax.plot(hourly_avg.index, hourly_avg[y_col], label='Terdaftar', marker='o', color='lightskyblue')
+        else:
+            ax.plot(hourly_avg.index, hourly_avg[y_col], label=user_type, marker='o')
+        ax.set(xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title, xticks=hourly_avg.index)
+        ax.legend(); ax.grid(True); fig.tight_layout()
+        return fig
+    raise ValueError(f"Kolom {x_col} atau {y_col} bukan numerik dan tidak bisa dihitung rata-ratanya.")
+
+# 2. Bar Chart Rata-rata Penyewaan Anatar Pengguna Kasual dan Terdaftar
+@instrument("chart.create_bar_chart_2")
+def create_bar_chart_2(df, x_col, y_col, title, user_type):
+    if df.empty:
+        raise ValueError("Tidak ada data untuk ditampilkan")
+    if isinstance(y_col, list):
+        if pd.api.types.is_numeric_dtype(df[y_col[0]]) and pd.api.types.is_numeric_dtype(df[y_col[1]]):
+            hourly_avg = df.set_index(x_col)[[y_col[0], y_col[1]]]
+            x = np.arange(len(hourly_avg)); width = 0.35
+            fig, ax = new_figure(figsize=(12, 8))
+            ax.bar(x - width/2, hourly_avg[y_col[0]], width, label='Kasual', color='lightcoral')
+            ax.bar(x + width/2, hourly_avg[y_col[1]], width, label='Terdaftar', color='lightskyblue')
+            ax.set(xticks=x, xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title)
+            for i in x: ax.text(x[i] - width/2, hourly_avg[y_col[0]][i], int(hourly_avg[y_col[0]][i]), ha='center', va='bottom')
+            for i in x: ax.text(x[i] + width/2, hourly_avg[y_col[1]][i], int(hourly_avg[y_col[1]][i]), ha='center', va='bottom')
+            ax.legend(); ax.grid(axis='y', alpha=0.7); fig.tight_layout()
+            return fig
+        raise ValueError(f"Kolom {y_col[0]} atau {y_col[1]} bukan numerik dan tidak bisa dihitung rata-ratanya.")
+    else:
+        if pd.api.types.is_numeric_dtype(df[y_col]):
+            hourly_avg = df.set_index(x_col)[[y_col]]
+            x = np.arange(len(hourly_avg)); width = 0.35
+            fig, ax = new_figure(figsize=(12, 8))
+            ax.bar(x, hourly_avg[y_col], width, label=user_type, color=('lightcoral' if user_type == 'Kasual' else 'lightskyblue'))
+            ax.set(xticks=x, xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title)
+            for i in x: ax.text(x[i], hourly_avg[y_col][i], int(hourly_avg[y_col][i]), ha='center', va='bottom')
+            ax.legend(); ax.grid(axis='y', alpha=0.7); fig.tight_layout()
+            return fig
+        raise ValueError(f"Kolom {y_col} bukan numerik dan tidak bisa dihitung rata-ratanya.")
+
+# 3. Pie Chart proporsi Penyewaan per Jam antara pengguna kasual dan registered
+# totals = total keseluruhan per kolom (Series) dari rollup cube
+@instrument("chart.create_pie_chart_2")
+def create_pie_chart_2(totals, x_col, y_col, title):
+    total_casual = totals['HOUR_casual_replaced_upper']
+    total_registered = totals['HOUR_registered']
+    total = total_casual + total_registered
+    fig, ax = new_figure(figsize=(3, 2.8)) 
+
+    if total == 0:
+        print("Tidak ada data penyewaan untuk dihitung proporsinya.")
+        ax.pie([1, 0], labels=["Tidak ada penyewaan", ""], autopct='', startangle=90) 
+        ax.set_title('Proporsi Penyewaan Kasual vs Terdaftar') 
+    else:
+        proporsi = [total_casual / total * 100, total_registered / total * 100]
+        labels = ['Kasual', 'Terdaftar']
+        colors = ['lightcoral', 'lightskyblue']
+        explode = (0.1, 0)
+
+        ax.pie(proporsi, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=90) #menggunakan ax untuk pie
+        ax.set_title('Proporsi Penyewaan Kasual vs Terdaftar Per Jam') 
+        ax.axis('equal') 
+    fig.tight_layout()
+    return fig
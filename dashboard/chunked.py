@@ -0,0 +1,228 @@
+"""Agregasi out-of-core untuk banyak file berformat day.csv / hour.csv.
+
+Dashboard membaca satu all_data.csv utuh ke memori. Untuk data bertahun-tahun
+dari beberapa sistem bikeshare, modul ini membaca semua CSV di sebuah folder
+(rekursif, mis. satu subfolder per sistem) per potongan ``chunksize`` baris,
+hanya kolom yang dibutuhkan, dan mengakumulasi sum/count per sel dalam satu
+kali jalan. Memori sebanding dengan ukuran potongan, bukan jumlah baris.
+
+Hasilnya sama dengan agregat yang dipakai grafik dashboard (lihat rollup.py):
+
+- file harian : total & rata-rata per musim, rata-rata musim x hari
+- file per jam: rata-rata kasual (setelah pemangkasan outlier) & terdaftar
+                per jam, serta proporsi total kasual vs terdaftar; tanpa file
+                harian, agregat musim juga diturunkan dari sini (``cnt``
+                dijumlah per tanggal, satu tanggal = satu hari)
+
+Hanya agregat yang datanya ada yang dicetak/diperiksa.
+
+Jenis file dikenali dari header (ada kolom ``hr`` = per jam). Setiap file bisa
+diproses di proses terpisah lalu hasil parsialnya digabung::
+
+    python dashboard/chunked.py data/ [--workers 4] [--chunksize 100000] [--check]
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ingest import CLIP_UPPER
+from rollup import DAY_NAMES, SEASON_NAMES
+from schema import SEASON_ORDER
+
+
+DEFAULT_CHUNKSIZE = 100_000
+DAY_USECOLS = ["season", "weekday", "cnt"]
+HOUR_USECOLS = ["dteday", "season", "weekday", "hr", "casual", "registered", "cnt"]
+
+
+def find_files(directory):
+    """Semua file .csv di bawah ``directory`` (rekursif, urutan tetap)."""
+    found = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        found.extend(os.path.join(root, name) for name in sorted(files) if name.endswith(".csv"))
+    return found
+
+
+def file_kind(path):
+    """"hour", "day", atau None (bukan format day.csv/hour.csv) berdasarkan header."""
+    columns = set(pd.read_csv(path, nrows=0).columns)
+    if set(HOUR_USECOLS) <= columns:
+        return "hour"
+    if set(DAY_USECOLS) <= columns:
+        return "day"
+    return None
+
+
+class Partial:
+    """Sum/count per sel untuk sebagian data; bisa digabung dengan ``merge``."""
+
+    def __init__(self):
+        self.season_weekday = None       # indeks (season, weekday), kolom sum/count
+        self.hour_season_weekday = None  # idem, diturunkan dari file per jam
+        self.hour = None                 # indeks hr, kolom casual_sum/registered_sum/count
+        self._dates = None               # cnt per (dteday, season, weekday) dari file per jam yang sedang dibaca
+        self.files = 0
+        self.rows = 0
+
+    @staticmethod
+    def _add(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return a.add(b, fill_value=0).astype("int64")
+
+    def add_days(self, chunk):
+        cells = chunk.astype("int64").groupby(["season", "weekday"])["cnt"].agg(["sum", "count"])
+        self.season_weekday = self._add(self.season_weekday, cells)
+        self.rows += len(chunk)
+
+    def add_hours(self, chunk):
+        chunk = chunk.astype({col: "int64" for col in HOUR_USECOLS if col != "dteday"})
+        # Sama dengan casual_replaced_upper di notebook / ingest.py
+        chunk["casual"] = chunk["casual"].clip(upper=CLIP_UPPER["casual"])
+        cells = chunk.groupby("hr").agg(casual_sum=("casual", "sum"), registered_sum=("registered", "sum"), count=("hr", "size"))
+        self.hour = self._add(self.hour, cells)
+        self._dates = self._add(self._dates, chunk.groupby(["dteday", "season", "weekday"])["cnt"].sum())
+        self.rows += len(chunk)
+
+    def finish_file(self):
+        # Jam satu tanggal bisa terpecah di dua potongan, jadi hari baru dihitung setelah file selesai dibaca
+        if self._dates is not None:
+            cells = self._dates.groupby(level=["season", "weekday"]).agg(["sum", "count"])
+            self.hour_season_weekday = self._add(self.hour_season_weekday, cells)
+            self._dates = None
+
+    def merge(self, other):
+        self.season_weekday = self._add(self.season_weekday, other.season_weekday)
+        self.hour_season_weekday = self._add(self.hour_season_weekday, other.hour_season_weekday)
+        self.hour = self._add(self.hour, other.hour)
+        self.files += other.files
+        self.rows += other.rows
+        return self
+
+    def _day_cells(self):
+        # File harian diutamakan; tanpa file harian dipakai sel dari file per jam
+        return self.season_weekday if self.season_weekday is not None else self.hour_season_weekday
+
+    def has_days(self):
+        return self._day_cells() is not None
+
+    def has_hours(self):
+        return self.hour is not None
+
+    # Hasil akhir, bentuknya sama dengan fungsi di rollup.py
+    def _seasons(self):
+        grouped = self._day_cells().groupby(level="season").sum()
+        grouped.index = pd.CategoricalIndex(grouped.index.map(SEASON_NAMES), categories=SEASON_ORDER, name="season_new")
+        return grouped
+
+    def season_totals(self):
+        return self._seasons()["sum"].rename("total_rentals")
+
+    def season_means(self):
+        grouped = self._seasons()
+        return (grouped["sum"] / grouped["count"]).rename("total_rentals")
+
+    def season_weekday_means(self):
+        cells = self._day_cells()
+        means = (cells["sum"] / cells["count"]).unstack("weekday")
+        means.index = pd.CategoricalIndex(means.index.map(SEASON_NAMES), categories=SEASON_ORDER, name="season_new")
+        means.columns = pd.Index(means.columns.map(lambda code: DAY_NAMES[code]), name="DAY_dteday")
+        return means.sort_index(axis=1)
+
+    def hourly_means(self):
+        means = pd.DataFrame({
+            "HOUR_casual_replaced_upper": self.hour["casual_sum"] / self.hour["count"],
+            "HOUR_registered": self.hour["registered_sum"] / self.hour["count"],
+        })
+        means.index.name = "HOUR_hr"
+        return means
+
+    def proportions(self):
+        totals = pd.Series({"HOUR_casual_replaced_upper": self.hour["casual_sum"].sum(), "HOUR_registered": self.hour["registered_sum"].sum()})
+        return totals / totals.sum()
+
+
+def aggregate_file(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Partial untuk satu file, dibaca per potongan (dijalankan di proses pool)."""
+    partial = Partial()
+    kind = file_kind(path)
+    if kind is None:
+        return partial
+    usecols = HOUR_USECOLS if kind == "hour" else DAY_USECOLS
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        if kind == "hour":
+            partial.add_hours(chunk)
+        else:
+            partial.add_days(chunk)
+    partial.finish_file()
+    partial.files = 1
+    return partial
+
+
+def aggregate_directory(directory, workers=1, chunksize=DEFAULT_CHUNKSIZE):
+    """Menggabungkan Partial semua file di ``directory``; ``workers`` > 1 memakai pool proses."""
+    files = find_files(directory)
+    result = Partial()
+    if workers == 1 or len(files) <= 1:
+        partials = (aggregate_file(path, chunksize) for path in files)
+        for partial in partials:
+            result.merge(partial)
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(aggregate_file, files, [chunksize] * len(files)):
+            result.merge(partial)
+    return result
+
+
+def check_against_rollup(result, path=None):
+    """Membandingkan agregat yang ada di ``result`` dengan jalur pandas in-memory dashboard (rollup cube).
+
+    AssertionError bila beda.
+    """
+    from data_loader import LOCAL_PATH
+    from rollup import hourly_means, load_day_cube, load_hour_cube, measure_totals, season_means, season_totals, season_weekday_means
+
+    if result.has_days():
+        day_cube = load_day_cube(path or LOCAL_PATH)
+        pd.testing.assert_series_equal(result.season_totals(), season_totals(day_cube), check_exact=True)
+        pd.testing.assert_series_equal(result.season_means(), season_means(day_cube), check_exact=True)
+        pd.testing.assert_frame_equal(result.season_weekday_means(), season_weekday_means(day_cube), check_exact=True)
+    if result.has_hours():
+        hour_cube = load_hour_cube(path or LOCAL_PATH)
+        totals = measure_totals(hour_cube)
+        pd.testing.assert_frame_equal(result.hourly_means(), hourly_means(hour_cube), check_exact=True, check_index_type=False)
+        pd.testing.assert_series_equal(result.proportions(), totals / totals.sum(), check_exact=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("directory")
+    parser.add_argument("--workers", type=int, default=1, help="jumlah proses (default 1)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--check", action="store_true", help="bandingkan dengan agregat dashboard dari all_data.csv")
+    args = parser.parse_args(argv)
+
+    result = aggregate_directory(args.directory, args.workers, args.chunksize)
+    print(f"{result.files} file, {result.rows} baris")
+    if not (result.has_days() or result.has_hours()):
+        raise SystemExit(f"Tidak ada file berformat day.csv/hour.csv di {args.directory}")
+    if result.has_days():
+        print()
+        print(result.season_totals().to_string(), end="\n\n")
+        print(result.season_weekday_means().round(1).to_string())
+    if result.has_hours():
+        print()
+        print(result.hourly_means().round(2).to_string(), end="\n\n")
+        print(result.proportions().round(4).to_string())
+    if args.check:
+        check_against_rollup(result)
+        print("\nSama persis dengan agregat dashboard.")
+
+
+if __name__ == "__main__":
+    main()
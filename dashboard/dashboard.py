@@ -1,236 +1,133 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import streamlit as st
-import matplotlib.ticker as ticker
-import numpy as np
-from babel.numbers import format_currency
 import datetime
+import os
+
+from chart_jobs import BUILDERS, SEASON_OPTIONS, USER_TYPES, filter_by_user_type, renderers, season_charts, user_type_charts
+from data_loader import data_version
+from figure_cache import render_many
+from ingest import start_watcher
+from metrics import instrument, recording, start_http_server, write_prometheus
+from prerender import prerendered_image
+from quantiles import load_month_quantiles, load_season_quantiles, range_summaries, season_summaries
+from rollup import build_cube, hourly_means, load_day_cube, load_hour_cube, season_weekday_means, slice_season
+from selection_index import load_day_index, load_hour_index
 
 
 # Mengatur layout agar lebih lebar
 st.set_page_config(layout="wide") 
 
-# Membaca data dan konversi tipe data
-try:
-    url = "https://raw.githubusercontent.com/StevErorr/Project-Data-Analysis/main/dashboard/all_data.csv"
-    df = pd.read_csv(url)
-
-    # Konversi 'DAY_dteday' dan 'dteday' ke datetime
-    try:
-        df['DAY_dteday'] = pd.to_datetime(df['DAY_dteday'])
-    except (KeyError, ValueError): 
-        st.warning("Kolom 'DAY_dteday' tidak ditemukan atau formatnya tidak valid. Melewati konversi untuk kolom ini.")
-        
+# Ingest baris per jam baru dari folder (opsional, lihat ingest.py); watcher
+# berjalan sekali per proses dan memperbarui cache secara inkremental
+if os.environ.get("DASHBOARD_INGEST_DIR"):
+    start_watcher(os.environ["DASHBOARD_INGEST_DIR"])
+
+# Metrik instrumentasi (lihat metrics.py): berkas teks Prometheus yang ditulis
+# ulang setiap rerun dan/atau endpoint /metrics. Panel debug waterfall di
+# sidebar hanya muncul bila DASHBOARD_DEBUG_PANEL=1.
+METRICS_FILE = os.environ.get("DASHBOARD_METRICS_FILE")
+if os.environ.get("DASHBOARD_METRICS_PORT"):
+    start_http_server(int(os.environ["DASHBOARD_METRICS_PORT"]))
+DEBUG_PANEL = os.environ.get("DASHBOARD_DEBUG_PANEL") == "1"
+
+# Backend grafik per deployment: "matplotlib" (bawaan, PNG dirender di server)
+# atau "vega" (hanya tabel agregat yang dikirim, grafik digambar di browser)
+CHART_BACKEND = os.environ.get("DASHBOARD_CHART_BACKEND", "matplotlib")
+if CHART_BACKEND not in BUILDERS:
+    raise ValueError(f"DASHBOARD_CHART_BACKEND tidak dikenal: {CHART_BACKEND} (pilihan: {', '.join(BUILDERS)})")
+
+# Semua data, agregat, dan grafik dihitung di dalam fungsi halaman yang sedang
+# dipilih saja. matplotlib/seaborn baru di-import saat sebuah grafik benar-benar
+# digambar (tidak terjadi bila gambarnya sudah ada di cache). Semua grafik satu
+# halaman dirender paralel lebih dulu, baru kemudian ditampilkan.
+
+# Tanpa filter tanggal, grafik dijawab oleh rollup cube. Dengan filter tanggal,
+# total dijawab oleh indeks seleksi (binary search + prefix sum), dan baris
+# mentah (heatmap) diambil sebagai slice dari indeks tersebut. Box plot digambar
+# dari ringkasan kuantil per (musim, bulan) (lihat quantiles.py); hanya bulan
+# di tepi rentang tanggal yang dihitung dari baris.
+
+# Membaca data (snapshot lokal, skema tipe data eksplisit, cache lintas rerun & sesi)
+def load_page_data(loader, *args):
     try:
-        df['dteday'] = pd.to_datetime(df['dteday'])
-    except (KeyError, ValueError): 
-        st.warning("Kolom 'dteday' tidak ditemukan atau formatnya tidak valid. Melewati konversi untuk kolom ini.")
-
-
-    # Pembersihan dan konversi tipe data (DIPINDAHKAN KE SINI)
-    for col in ['HOUR_casual_replaced_upper', 'HOUR_registered', 'HOUR_hr']:
+        return loader(*args)
+    except Exception as e:
+        st.error(f"Terjadi kesalahan saat membaca file: {e}")
+        st.stop()  
+
+
+
+# Render grafik lewat cache PNG: kunci = (jenis grafik, pilihan filter, versi data).
+# Bila kunci belum ada di cache, PNG diambil dari hasil pre-render (prerender.py)
+# untuk versi data yang sama; hanya bila tidak ada, grafik dirender (paralel di
+# pool thread bersama). Hasil per grafik: PNG atau exception. Backend vega tidak
+# memakai PNG sama sekali (lihat build_specs).
+def render_charts(jobs):
+    if CHART_BACKEND == "vega":
+        return build_specs(jobs)
+    version = data_version()
+    return render_many({name: (key + (version,), lambda key=key, render=render: prerendered_image(key, version) or render())
+                        for name, (key, render) in jobs.items()})
+
+# Backend vega: spesifikasi Vega-Lite dibuat langsung dari tabel agregat (murah,
+# tanpa cache gambar maupun pool render). Hasil per grafik: dict atau exception.
+def build_specs(jobs):
+    specs = {}
+    for name, (key, render) in jobs.items():
         try:
-            df[col] = df[col].astype(str).str.strip()
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-        except KeyError:
-            st.warning(f"Kolom {col} tidak ditemukan.")
+            specs[name] = render()
         except Exception as e:
-            st.error(f"Terjadi kesalahan konversi tipe data pada kolom {col}: {e}")
-            st.stop()
-    
-
-except Exception as e:
-    st.error(f"Terjadi kesalahan saat membaca file: {e}")
-    st.stop()  
-
-
-# Menghapus DAY_ pada nama kolom kecuali untuk kolom DAY_dteday
-new_columns = {col: col.replace("DAY_", "") for col in df.columns if col.startswith("DAY_") and col != "DAY_dteday"}
-df = df.rename(columns=new_columns)
-
-# Fungsi untuk memfilter data berdasarkan musim
-def filter_by_season(df, selected_season):
-    if selected_season == "All Season":
-        return df
-    else:
-        return df[df['season_new'] == selected_season]
-
-# Fungsi untuk memfilter data berdasarkan jenis pengguna
-def filter_by_user_type(df, user_type):
-    if user_type == "Semua Pengguna":
-        return df
-    elif user_type == "Kasual":
-        return df[['HOUR_hr', 'HOUR_casual_replaced_upper']] # Hanya kolom kasual
-    elif user_type == "Terdaftar":
-        return df[['HOUR_hr', 'HOUR_registered']]  # Hanya kolom terdaftar
-    else:
-        return df # Handle kasus jika ada input yang tidak valid
-
-
-### AREA LOAD DATA 1
-# 1. Membuat Bar Chart 
-def create_bar_chart(df, x_col, y_col, title):
-    def format_angka(x, pos):
-        if x >= 1000000:
-            return '%1.0fJ' % (x * 1e-6)
-        elif x >= 1000:
-            return '%1.0fK' % (x * 1e-3)
-        else:
-            return '%1.0f' % x
-    
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.barplot(x=x_col, y=y_col, data=df, estimator='sum', ax=ax)
-    ax.set_title(title)
-    ax.set_xlabel(x_col)
-    ax.set_ylabel('Total Jumlah ' + y_col)
-    ax.yaxis.set_major_formatter(ticker.FuncFormatter(format_angka))
-    plt.tight_layout()
-    return fig
-
-try:
-    bar_chart = create_bar_chart(df, 'season_new', 'total_rentals', 'Bar Chart Total Penyewaan per Musim')
-    #st.pyplot(bar_chart)
-except KeyError as e:
-    st.error(f"Kolom {e} tidak ditemukan di DataFrame. Pastikan nama kolom sudah benar.")
-    st.stop()
-
-# 2. Membuat Box Plot 
-def create_box_plot(df, x_col, y_col, title):
-    fig, ax = plt.subplots(figsize=(8, 6))
-    sns.boxplot(x=x_col, y=y_col, data=df, ax=ax) 
-    ax.set_title(title)
-    ax.set_xlabel(x_col)
-    ax.set_ylabel('Jumlah ' + y_col) 
-    plt.tight_layout()
-    return fig
-
-try:
-    box_plot = create_box_plot(df, 'season_new', 'total_rentals', 'Box Plot Total Penyewaan per Musim')
-    #st.pyplot(box_plot)
-except KeyError as e:
-    st.error(f"Kolom {e} tidak ditemukan di DataFrame. Pastikan nama kolom sudah benar.")
-    st.stop()
-
-# 3. Membuat Line Chart 
-def create_line_chart(df, x_col, y_col, title):
-    fig, ax = plt.subplots(figsize=(8, 6))
-    df_grouped = df.groupby(x_col)[y_col].mean()
-    ax.plot(df_grouped.index, df_grouped.values, marker='o')
-    ax.set_title(title)
-    ax.set_xlabel(x_col)
-    ax.set_ylabel('Rata-rata ' + y_col)
-    plt.tight_layout()
-    return fig
-
-try:
-    line_chart = create_line_chart(df, 'season_new', 'total_rentals', 'Line Chart Rata-rata Penyewaan per Musim')
-    #st.pyplot(line_chart)
-except KeyError as e:
-    st.error(f"Kolom {e} tidak ditemukan di DataFrame. Pastikan nama kolom sudah benar.")
-    st.stop()
-
-# 4. Membuat heatmap
-def create_heatmap(df): 
-    try:
-        plt.figure(figsize=(8, 6))
-        pivot_table = df.pivot_table(values='total_rentals', index='season_new', columns=df['DAY_dteday'].dt.day_name(), aggfunc='mean')
-        sns.heatmap(pivot_table, annot=True, cmap="YlGnBu", fmt=".0f")
-        plt.title('Heatmap Rata-rata Penyewaan per Musim dan Hari dalam Seminggu')
-        plt.xlabel('Hari dalam Seminggu')
-        plt.ylabel('Musim')
-        return plt # Kembalikan objek plt
-    except KeyError as e:
-        st.error(f"Kolom {e} tidak ditemukan di DataFrame. Pastikan nama kolom sudah benar.")
-        return None # Kembalikan None jika terjadi error
-    except AttributeError as e:
-        st.error(f"Kolom 'DAY_dteday' harus bertipe datetime. Pastikan format datanya benar.")
-        return None
-    except Exception as e:
-        st.error(f"Terjadi kesalahan dalam pembuatan heatmap: {e}")
-        return None
-
-
-
-## AREA LOAD DATA 2 
-# 1. Line Chart Rata-rata Penyewaan per Jam
-def create_line_chart_2(df, x_col, y_col, title, user_type):
-    if df.empty:
-        st.write("Tidak ada data untuk ditampilkan")
-        return None
-    if pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col]):
-        hourly_avg = df.groupby('HOUR_hr')[[x_col, y_col]].mean()
-        fig, ax = plt.subplots(figsize=(12, 8))
-        if user_type == "Semua Pengguna":
-            ax.plot(hourly_avg.index, hourly_avg['HOUR_casual_replaced_upper'], label='Kasual', marker='o', color='lightcoral')
-            ax.plot(hourly_avg.index, hourly_avg['HOUR_registered'], label='Terdaftar', marker='o', color='lightskyblue')
-        elif user_type == "Kasual":
-            ax.plot(hourly_avg.index, hourly_avg[y_col], label='Kasual', marker='o', color='lightcoral')
-        elif user_type == "Terdaftar":
-            ax.plot(hourly_avg.index, hourly_avg[y_col], label='Terdaftar', marker='o', color='lightskyblue')
-        else:
-            ax.plot(hourly_avg.index, hourly_avg[y_col], label=user_type, marker='o')
-        ax.set(xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title, xticks=hourly_avg.index)
-        ax.legend(); ax.grid(True); fig.tight_layout()
-        return fig
-    st.write(f"Kolom {x_col} atau {y_col} bukan numerik dan tidak bisa dihitung rata-ratanya.")
-    return None
-
-# 2. Bar Chart Rata-rata Penyewaan Anatar Pengguna Kasual dan Terdaftar
-def create_bar_chart_2(df, x_col, y_col, title, user_type):
-    if df.empty:
-        st.write("Tidak ada data untuk ditampilkan")
-        return None
-    if isinstance(y_col, list):
-        if pd.api.types.is_numeric_dtype(df[y_col[0]]) and pd.api.types.is_numeric_dtype(df[y_col[1]]):
-            hourly_avg = df.groupby(x_col)[[y_col[0], y_col[1]]].mean()
-            x = np.arange(len(hourly_avg)); width = 0.35
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.bar(x - width/2, hourly_avg[y_col[0]], width, label='Kasual', color='lightcoral')
-            ax.bar(x + width/2, hourly_avg[y_col[1]], width, label='Terdaftar', color='lightskyblue')
-            ax.set(xticks=x, xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title)
-            for i in x: ax.text(x[i] - width/2, hourly_avg[y_col[0]][i], int(hourly_avg[y_col[0]][i]), ha='center', va='bottom')
-            for i in x: ax.text(x[i] + width/2, hourly_avg[y_col[1]][i], int(hourly_avg[y_col[1]][i]), ha='center', va='bottom')
-            ax.legend(); ax.grid(axis='y', alpha=0.7); fig.tight_layout()
-            return fig
-        st.write(f"Kolom {y_col[0]} atau {y_col[1]} bukan numerik dan tidak bisa dihitung rata-ratanya.")
-        return None
-    else:
-        if pd.api.types.is_numeric_dtype(df[y_col]):
-            hourly_avg = df.groupby(x_col)[[y_col]].mean()
-            x = np.arange(len(hourly_avg)); width = 0.35
-            fig, ax = plt.subplots(figsize=(12, 8))
-            ax.bar(x, hourly_avg[y_col], width, label=user_type, color=('lightcoral' if user_type == 'Kasual' else 'lightskyblue'))
-            ax.set(xticks=x, xlabel='Jam (HOUR_hr)', ylabel='Rata-rata Penyewaan', title=title)
-            for i in x: ax.text(x[i], hourly_avg[y_col][i], int(hourly_avg[y_col][i]), ha='center', va='bottom')
-            ax.legend(); ax.grid(axis='y', alpha=0.7); fig.tight_layout()
-            return fig
-        st.write(f"Kolom {y_col} bukan numerik dan tidak bisa dihitung rata-ratanya.")
-        return None
-
-# 3. Pie Chart proporsi Penyewaan per Jam antara pengguna kasual dan registered
-def create_pie_chart_2(df, x_col, y_col, title):
-    total_casual = df['HOUR_casual_replaced_upper'].sum()
-    total_registered = df['HOUR_registered'].sum()
-    total = total_casual + total_registered
-    fig, ax = plt.subplots(figsize=(3, 2.8)) 
-
-    if total == 0:
-        print("Tidak ada data penyewaan untuk dihitung proporsinya.")
-        ax.pie([1, 0], labels=["Tidak ada penyewaan", ""], autopct='', startangle=90) 
-        ax.set_title('Proporsi Penyewaan Kasual vs Terdaftar') 
-    else:
-        proporsi = [total_casual / total * 100, total_registered / total * 100]
-        labels = ['Kasual', 'Terdaftar']
-        colors = ['lightcoral', 'lightskyblue']
-        explode = (0.1, 0)
-
-        ax.pie(proporsi, explode=explode, labels=labels, colors=colors, autopct='%1.1f%%', shadow=True, startangle=90) #menggunakan ax untuk pie
-        ax.set_title('Proporsi Penyewaan Kasual vs Terdaftar Per Jam') 
-        ax.axis('equal') 
-    fig.tight_layout()
-    return fig
-
+            specs[name] = e
+    return specs
+
+# Menampilkan satu grafik hasil render_charts (atau pesan kesalahannya)
+def show_chart(chart, header):
+    if isinstance(chart, KeyError):
+        st.error(f"Kolom {chart} tidak ditemukan.")
+    elif isinstance(chart, Exception):
+        st.error(f"Terjadi kesalahan: {chart}")
+    elif isinstance(chart, dict):
+        st.header(header)
+        st.vega_lite_chart(chart, use_container_width=True)
+    elif chart is not None:
+        st.header(header)
+        st.image(chart, use_container_width=True)
+
+# Fungsi untuk memfilter data berdasarkan musim (dan rentang tanggal) lewat
+# indeks seleksi; hasilnya view, bukan salinan
+@instrument("filter.filter_by_season")
+def filter_by_season(day_index, selected_season, start_date=None, end_date=None):
+    return day_index.filter_days(selected_season, start_date, end_date)
+
+# Sidebar untuk memilih rentang tanggal; mengembalikan (awal, akhir)
+def date_range_filter(bounds):
+    selected = st.sidebar.date_input("Pilih Rentang Tanggal:", value=bounds, min_value=bounds[0], max_value=bounds[1])
+    if len(selected) == 2:
+        return tuple(selected)
+    # Baru tanggal awal yang dipilih
+    return (selected[0], bounds[1]) if selected else bounds
+
+# Panel debug: waterfall semua span rerun ini (posisi & lebar batang = awal & durasi)
+def show_waterfall(trace):
+    spans = sorted(trace["spans"], key=lambda s: s["offset"])
+    total = max((s["offset"] + s["seconds"] for s in spans), default=0) or 1
+    bars = []
+    for s in spans:
+        detail = f"{s['seconds'] * 1000:.1f} ms"
+        if s["rows"] is not None:
+            detail += f" · {s['rows']:,} baris"
+        if s["bytes"] is not None:
+            detail += f" · {s['bytes'] / 1024:,.0f} KB"
+        if s["cache"]:
+            detail += f" · {s['cache']}"
+        color = "#d9534f" if s["error"] else "#1f77b4"
+        bars.append(f"""
+            <div style="font-size: 11px; margin-top: 4px; padding-left: {12 * s['depth']}px;">{s['span']} <span style="opacity: 0.7;">{detail}</span></div>
+            <div style="position: relative; height: 6px; background-color: #eaf5f8;">
+                <div style="position: absolute; left: {100 * s['offset'] / total:.2f}%; width: {max(100 * s['seconds'] / total, 0.5):.2f}%; height: 6px; background-color: {color};"></div>
+            </div>""")
+    st.sidebar.subheader(f"Waterfall rerun ({total * 1000:.0f} ms)")
+    st.sidebar.markdown("".join(bars), unsafe_allow_html=True)
 
 
 # AREA CUSTOM SIDE BAR DAN BACKGROUND
@@ -284,22 +181,39 @@ st.write("Analisa data ini merupakan proses belajar dalam rangka pengerjaan proy
 st.write("Sumber : https://drive.google.com/file/d/1RaBmV6Q6FYWU4HWZs80Suqd7KQC34diQ/view")
 
 
+@instrument("page.halaman_pertanyaan_1")
 def halaman_pertanyaan_1():
     st.title('Analisis Data Pertanyaan 1 (Menggunakan data **DAY**)')
     st.write("Pertanyaan 1 : Bagaimana musim memengaruhi jumlah penyewaan sepeda? (Pertanyaan ini bertujuan untuk memahami faktor musim yang paling signifikan mempengaruhi permintaan sepeda. Informasi ini krusial untuk manajemen inventaris dan penyesuaian pada musim yang akan datang atau sedang berlangsung). Berikut adalah analisis jumlah penyewa sepeda per musim.")
 
+    day_index = load_page_data(load_day_index)
+
     # Sidebar untuk memilih musim
-    season_options = ["All Season", "Spring", "Summer", "Fall", "Winter"]
-    selected_season = st.sidebar.selectbox(" Analisa ini dilakukan berdasarkan musim. Silahkan pilih Musim:", season_options)
+    selected_season = st.sidebar.selectbox(" Analisa ini dilakukan berdasarkan musim. Silahkan pilih Musim:", SEASON_OPTIONS)
+    start_date, end_date = date_range_filter(day_index.date_bounds())
+    full_range = (start_date, end_date) == day_index.date_bounds()
+    range_key = () if full_range else (start_date, end_date)
     
-    # Filter data berdasarkan musim yang dipilih
-    filtered_df = filter_by_season(df, selected_season)
+    # Filter berdasarkan musim (dan rentang tanggal) yang dipilih
+    if full_range:
+        season_cube = slice_season(load_page_data(load_day_cube), selected_season)
+    else:
+        season_cube = day_index.day_rollup(selected_season, start_date, end_date)
+
+    # Pengecekan penting: Apakah ada data pada musim dan rentang tanggal ini?
+    if season_cube.empty:
+        st.warning(f"Tidak ada data penyewaan untuk musim {selected_season} pada rentang tanggal yang dipilih.")
+        return
+
+    # Rata-rata musim x hari untuk heatmap
+    def weekday_means():
+        if full_range:
+            return season_weekday_means(season_cube)
+        filtered_df = filter_by_season(day_index, selected_season, start_date, end_date)
+        return season_weekday_means(build_cube(filtered_df, ['season', 'weekday'], ['total_rentals']))
 
     # Hitung total penyewaan (sekarang berdasarkan filter)
-    if selected_season == "All Season":
-        total_rentals = df['total_rentals'].sum()
-    else:
-        total_rentals = filtered_df['total_rentals'].sum()
+    total_rentals = season_cube['total_rentals_sum'].sum()
 
     #Memformat angka dengan pemisah ribuan.
     def format_number(number):
@@ -321,51 +235,56 @@ def halaman_pertanyaan_1():
     row1_col1, row1_col2, row1_col3 = st.columns(3)
     row2_col1 = st.columns(1)[0]
 
+    # Render keempat grafik sekaligus
+    # Ringkasan kuantil per musim untuk box plot
+    def summaries():
+        if full_range:
+            return season_summaries(load_season_quantiles(), selected_season)
+        return range_summaries(load_month_quantiles(), selected_season, start_date, end_date,
+                               lambda season, start, end: day_index.filter_days(season, start, end)['total_rentals'])
+
+    charts = render_charts(renderers(season_charts(selected_season, season_cube, summaries, weekday_means, CHART_BACKEND), range_key))
+
     # Bar Chart
-    try:
-        bar_chart = create_bar_chart(filtered_df, 'season_new', 'total_rentals', f'Bar Chart Total Penyewaan per Musim ({selected_season})') 
-        with row1_col1:
-            st.header(f"BAR CHART Total Penyewaan per Musim ({selected_season})")
-            st.pyplot(bar_chart)
-    except KeyError as e:
-        st.error(f"Kolom {e} tidak ditemukan.")
+    with row1_col1:
+        show_chart(charts['bar_chart'], f"BAR CHART Total Penyewaan per Musim ({selected_season})")
 
     # Box Plot
-    try:
-        box_plot = create_box_plot(filtered_df, 'season_new', 'total_rentals', f'Box Plot Total Penyewaan per Musim ({selected_season})')
-        with row1_col2:
-            st.header(f"BOX PLOT Total Penyewaan per Musim ({selected_season})")
-            st.pyplot(box_plot)
-    except KeyError as e:
-        st.error(f"Kolom {e} tidak ditemukan.")
+    with row1_col2:
+        show_chart(charts['box_plot'], f"BOX PLOT Total Penyewaan per Musim ({selected_season})")
 
     # Line Chart
-    try:
-        line_chart = create_line_chart(filtered_df, 'season_new', 'total_rentals', f'Line Chart Rata-rata Penyewaan per Musim ({selected_season})')
-        with row1_col3:
-            st.header(f"LINE CHART Rata-rata Penyewaan per Musim ({selected_season})")
-            st.pyplot(line_chart)
-    except KeyError as e:
-        st.error(f"Kolom {e} tidak ditemukan.")
+    with row1_col3:
+        show_chart(charts['line_chart'], f"LINE CHART Rata-rata Penyewaan per Musim ({selected_season})")
 
     # Heat Map
-    heatmap = create_heatmap(filtered_df)
-    if heatmap:
-        with row2_col1:
-            st.header(f"HEAT MAP Rata-rata Penyewaan per Musim ({selected_season})")
-            st.pyplot(heatmap)
+    with row2_col1:
+        show_chart(charts['heatmap'], f"HEAT MAP Rata-rata Penyewaan per Musim ({selected_season})")
 
     st.title("KONKLUSI")
     st.write("Perbedaan musim yang ada akan memengaruhi jumlah penyewaan tiap musim.Berdasarkan analisis dari ketiga grafik (box plot, bar chart, dan line chart), dapat ditarik kesimpulan bahwa musim gugur merupakan musim puncak untuk penyewaan sepeda, diikuti oleh musim panas, lalu musim dingin, dan terakhir musim semi dengan permintaan terendah. Perbedaan ini kemungkinan besar dipengaruhi oleh faktor cuaca, di mana musim gugur menawarkan kondisi yang ideal untuk bersepeda. Informasi ini berguna untuk manajemen ketersediaan sepeda, sehingga perlu dioptimalkan untuk memenuhi permintaan tinggi di musim gugur dan mengurangi jumlah sepeda yang tersedia atau menawarkan promosi di musim semi. Hal ini juga dapat memandu strategi pemasaran dan penyesuaian operasional, seperti jam operasional untuk memaksimalkan efisiensi dan pendapatan.")
 
 
 ## HALAMAN 2
+@instrument("page.halaman_pertanyaan_2")
 def halaman_pertanyaan_2():
     st.title("Pertanyaan 2 (Menggunakan data **HOUR**)")
     st.write("Pertanyaan 2 : Bagaimana perbedaan pola penyewaan per jam antara pengguna kasual dan terdaftar? (bertujuan untuk Memahami perbedaan antara pengguna kasual dan terdaftar ,penting untuk mengembangkan strategi pemasaran ke target pelanggan yang efektif.). Berikut adalah analisis perbedaan pola penyewaan per jam antara pengguna kasual dan terdaftar") 
 
+    hour_index = load_page_data(load_hour_index)
+
     # Sidebar untuk memilih jenis pengguna
-    user_type = st.sidebar.selectbox("Pilih Jenis Pengguna:", ["Semua Pengguna", "Kasual", "Terdaftar"])
+    user_type = st.sidebar.selectbox("Pilih Jenis Pengguna:", USER_TYPES)
+    start_date, end_date = date_range_filter(hour_index.date_bounds())
+    full_range = (start_date, end_date) == hour_index.date_bounds()
+    range_key = () if full_range else (start_date, end_date)
+
+    # Rata-rata per jam (24 baris) dari rollup cube, atau dari indeks seleksi bila ada filter tanggal
+    if full_range:
+        hour_cube = load_page_data(load_hour_cube)
+    else:
+        hour_cube = hour_index.hour_rollup(start_date, end_date)
+    df = hourly_means(hour_cube).reset_index()
 
     # Filter data berdasarkan jenis pengguna
     filtered_df = filter_by_user_type(df, user_type)
@@ -375,53 +294,24 @@ def halaman_pertanyaan_2():
         st.warning(f"Tidak ada data untuk jenis pengguna: {user_type}")
         return  # Hentikan eksekusi fungsi jika DataFrame kosong
 
-    # Reset index jika diperlukan (kemungkinan kecil dibutuhkan sekarang)
-    filtered_df = filtered_df.reset_index(drop=True)
-
     # Membuat kolom untuk grafik
     row1_col1, row1_col2 = st.columns(2)
     row2_col1 = st.columns(1)[0]
 
+    # Render ketiga grafik sekaligus
+    charts = render_charts(renderers(user_type_charts(user_type, hour_cube, CHART_BACKEND), range_key))
+
     # Line Chart
-    try:
-        if user_type == "Semua Pengguna":
-            line_chart2 = create_line_chart_2(filtered_df, 'HOUR_casual_replaced_upper', 'HOUR_registered', 'Line Chart Rata-rata Penyewaan Pengguna Kasual & Terdaftar per Jam', user_type)
-        elif user_type == "Kasual":
-            line_chart2 = create_line_chart_2(filtered_df, 'HOUR_casual_replaced_upper', 'HOUR_casual_replaced_upper', 'Line Chart Rata-rata Penyewaan Pengguna Kasual per Jam', user_type)
-        elif user_type == "Terdaftar":
-            line_chart2 = create_line_chart_2(filtered_df, 'HOUR_registered', 'HOUR_registered', 'Line Chart Rata-rata Penyewaan Pengguna Terdaftar per Jam ', user_type)
-        with row1_col1:
-            st.header(f"Rata-rata Penyewaan per Jam ({user_type})")
-            st.pyplot(line_chart2)
-    except KeyError as e:
-        st.error(f"Kolom {e} tidak ditemukan.")
-        st.stop()
-
-
-    # Bar Chart    
-    try:
-        if user_type == "Semua Pengguna":
-            bar_chart_2 = create_bar_chart_2(df, 'HOUR_hr', ['HOUR_casual_replaced_upper', 'HOUR_registered'], 'Bar Chart Rata-rata Penyewaan Pengguna Kasual & Terdaftar per Jam', user_type)
-        elif user_type == "Kasual":
-            bar_chart_2 = create_bar_chart_2(filtered_df, 'HOUR_hr', 'HOUR_casual_replaced_upper', 'Bar Chart Rata-rata Penyewaan Pengguna Kasual per Jam', user_type)
-        elif user_type == "Terdaftar":
-            bar_chart_2 = create_bar_chart_2(filtered_df, 'HOUR_hr', 'HOUR_registered', 'Bar Chart Rata-rata Penyewaan Pengguna Terdaftar per Jam', user_type)
-        with row1_col2:
-            st.header(f"Rata-rata Penyewaan per Jam ({user_type})")
-            st.pyplot(bar_chart_2)
-    except Exception as e:
-        st.error(f"Terjadi kesalahan: {e}")
-        st.stop()
+    with row1_col1:
+        show_chart(charts['line_chart_2'], f"Rata-rata Penyewaan per Jam ({user_type})")
+
+    # Bar Chart
+    with row1_col2:
+        show_chart(charts['bar_chart_2'], f"Rata-rata Penyewaan per Jam ({user_type})")
 
     # Pie Chart
-    try:
-        pie_chart_2 = create_pie_chart_2(df, 'HOUR_hr', ['HOUR_casual_replaced_upper', 'HOUR_registered'], 'Proporsi Penyewaan Sepeda Antara Pengguna Kasual & Terdaftar per Jam')
-        with row2_col1:
-            st.header("Proporsi Total Penyewa per Jam")
-            st.pyplot(pie_chart_2)
-    except Exception as e:
-        st.error(f"Terjadi kesalahan: {e}")
-        st.stop()
+    with row2_col1:
+        show_chart(charts['pie_chart_2'], "Proporsi Total Penyewa per Jam")
 
     st.title("KONKLUSI")
     st.write("Terdapat pola penyewaan per jam yang berbeda antara pengguna kasual dan terdaftar. Berdasarkan hasil analisa, pengguna terdaftar cenderung menyewa pada jam-jam sibuk dipagi hari (jam 7-8) dan sore hari(jam 16-18). Hal ini menunjukkan pola penyewaan yang mungkin memilki keterkaitan dengan waktu masuk dan pulang kerja. Sedangkan untuk pengguna kasual memiilki pola penyewaan yang tidak terjadi lonjakan signifikan, penyewaan naik perlahan dari mulai pagi hingga sore hari kemudian terjadi penurunan setelah mulai malam.")
@@ -449,11 +339,19 @@ with st.sidebar:
     st.write("Analisa data ini merupakan proses belajar dalam rangka pengerjaan proyek (Belajar Analisis Data dengan Python). " )
     st.caption('Copyright © Steven F H 2025')
 
+    # Panel debug performa (opsional); tanpa panel tidak ada perekaman per rerun
+    show_trace = DEBUG_PANEL and st.checkbox("Tampilkan waterfall waktu (debug)")
+
 # Routing halaman (tidak berubah)
-if st.session_state.pilihan == "Pertanyaan 1":
-    halaman_pertanyaan_1()
-elif st.session_state.pilihan == "Pertanyaan 2":
-    halaman_pertanyaan_2()
+with recording(show_trace) as trace:
+    if st.session_state.pilihan == "Pertanyaan 1":
+        halaman_pertanyaan_1()
+    elif st.session_state.pilihan == "Pertanyaan 2":
+        halaman_pertanyaan_2()
+if trace is not None:
+    show_waterfall(trace)
+if METRICS_FILE:
+    write_prometheus(METRICS_FILE)
 
 
 st.caption('Copyright © Steven F H 2025')
@@ -0,0 +1,298 @@
+"""Loader data all_data untuk dashboard.
+
+Membaca ``dashboard/all_data.csv`` dari disk lokal (URL GitHub hanya dipakai
+jika file lokal tidak ada) dengan skema tipe data eksplisit, lalu menyimpan
+hasilnya di memori proses. Streamlit mengeksekusi ulang ``dashboard.py`` pada
+setiap perubahan widget, tetapi modul yang di-import tetap hidup, sehingga
+cache di sini berlaku lintas rerun dan lintas sesi. Cache dibatalkan ketika
+mtime/ukuran file berubah DAN isi file (hash SHA-1) memang berbeda.
+
+Bila ``pyarrow`` terpasang, data dibaca dari snapshot Feather (lihat
+``snapshot.py``) dan hanya kolom yang diminta yang dimuat. Tabel hari dan jam
+yang ternormalisasi (lihat ``data_model.py``) memakai cache yang sama.
+
+Baris baru yang ditambahkan ke file lewat ``apply_delta`` (lihat ``ingest.py``)
+tidak memicu pembacaan ulang: semua cache versi lama dibawa ke versi baru
+dengan fungsi pembaruan yang hanya memproses delta. Versi barunya juga
+dihitung dari delta saja (hash versi lama + byte yang ditambahkan), bukan
+dari hash ulang seluruh file.
+"""
+import hashlib
+import os
+import threading
+
+import pandas as pd
+
+from metrics import cache_event, span
+from schema import apply_schema
+
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+# DASHBOARD_DATA_PATH: file all_data lain (mis. data sintetis untuk benchmarks/bench_scale.py)
+LOCAL_PATH = os.environ.get("DASHBOARD_DATA_PATH", os.path.join(DATA_DIR, "all_data.csv"))
+REMOTE_URL = "https://raw.githubusercontent.com/StevErorr/Project-Data-Analysis/main/dashboard/all_data.csv"
+
+# Skema eksplisit all_data.csv (kolom tanggal diparsing terpisah)
+DATE_COLUMNS = ["DAY_dteday", "dteday"]
+DATE_FORMAT = "%Y-%m-%d"
+DTYPES = {
+    "DAY_instant": "int64",
+    "DAY_season": "int64",
+    "DAY_yr": "int64",
+    "DAY_mnth": "int64",
+    "DAY_holiday": "int64",
+    "DAY_weekday": "int64",
+    "DAY_workingday": "int64",
+    "DAY_weathersit": "int64",
+    "DAY_temp": "float64",
+    "DAY_atemp": "float64",
+    "DAY_hum": "float64",
+    "DAY_windspeed": "float64",
+    "DAY_casual": "int64",
+    "DAY_registered": "int64",
+    "DAY_total_rentals": "int64",
+    "DAY_season_new": "object",
+    "HOUR_instant": "int64",
+    "HOUR_season": "int64",
+    "HOUR_yr": "int64",
+    "HOUR_mnth": "int64",
+    "HOUR_hr": "int64",
+    "HOUR_holiday": "int64",
+    "HOUR_weekday": "int64",
+    "HOUR_workingday": "int64",
+    "HOUR_weathersit": "int64",
+    "HOUR_temp": "float64",
+    "HOUR_atemp": "float64",
+    "HOUR_hum": "float64",
+    "HOUR_windspeed": "float64",
+    "HOUR_casual": "int64",
+    "HOUR_registered": "int64",
+    "HOUR_cnt": "int64",
+    "HOUR_windspeed_replaced_upper": "float64",
+    "HOUR_casual_replaced_upper": "int64",
+}
+
+_cache = {}
+_versions = {}
+_lock = threading.RLock()
+_derived = {}
+_derived_lock = threading.RLock()
+
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def _chained_hash(version, path, offset):
+    # Versi setelah append: hash(versi lama + byte mulai ``offset``), hanya membaca bagian yang ditambahkan
+    sha1 = hashlib.sha1(version.encode("utf-8"))
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def _strip_day_prefix(df):
+    # Menghapus DAY_ pada nama kolom kecuali untuk kolom DAY_dteday
+    new_columns = {col: col.replace("DAY_", "") for col in df.columns if col.startswith("DAY_") and col != "DAY_dteday"}
+    return df.rename(columns=new_columns)
+
+
+def _source_column(col):
+    # Nama kolom setelah prefix DAY_ dihapus -> nama kolom asli di CSV
+    return col if col in DTYPES or col in DATE_COLUMNS else f"DAY_{col}"
+
+
+def read_all_data(source, columns=None, typed=True):
+    """Membaca all_data.csv dari path/URL dengan skema eksplisit (tanpa cache).
+
+    Dengan ``typed=True`` rentang nilai divalidasi dan kolom di-downcast
+    sesuai ``schema.py``.
+    """
+    usecols = [_source_column(col) for col in columns] if columns else None
+    parse_dates = [col for col in DATE_COLUMNS if usecols is None or col in usecols]
+    with span("load.read_csv") as s:
+        df = s.result(pd.read_csv(source, usecols=usecols, dtype=DTYPES, parse_dates=parse_dates, date_format=DATE_FORMAT))
+    return prepare_all_data(df, typed)
+
+
+def prepare_all_data(df, typed=True):
+    """Menerapkan skema (opsional) dan menghapus prefix DAY_ pada DataFrame berkolom all_data.csv."""
+    if typed:
+        df = apply_schema(df)
+    return _strip_day_prefix(df)
+
+
+def _read(table, reader, path, columns):
+    try:
+        from snapshot import read_snapshot
+    except ImportError:
+        # pyarrow tidak terpasang: baca langsung dari CSV
+        return reader(path, columns)
+    df = read_snapshot(table, columns, csv_path=path)
+    return df[list(columns)] if columns else df
+
+
+def load_table(table, reader, path=LOCAL_PATH, columns=None):
+    """Memuat tabel ``table`` hasil ``reader(path, columns)`` dengan cache di memori.
+
+    ``columns`` memakai nama kolom setelah prefix DAY_ dihapus (mis.
+    ``season_new``, ``HOUR_hr``); ``None`` berarti semua kolom.
+
+    DataFrame yang dikembalikan dipakai bersama oleh semua sesi, jadi jangan
+    diubah in-place (filter dan rename selalu menghasilkan objek baru).
+    """
+    return _load(table, reader, path, tuple(columns) if columns else None)[1]
+
+
+def load_all_data(path=LOCAL_PATH, columns=None):
+    """Mengembalikan DataFrame all_data (denormalisasi) yang sudah bertipe."""
+    return load_table("all_data", read_all_data, path, columns)
+
+
+def data_version(path=LOCAL_PATH):
+    """Hash isi file yang sedang dipakai, untuk kunci cache turunan (agregat, grafik).
+
+    Setelah ``apply_delta`` versinya adalah hash berantai versi lama + delta,
+    jadi bisa berbeda dengan hash file yang dihitung proses lain; keduanya
+    tetap berubah bila isi file berubah.
+    """
+    if not os.path.exists(path):
+        return "remote"
+    return _version(path, _file_signature(path))[1]
+
+
+def _version(path, signature):
+    # Hash isi file hanya dihitung ulang bila mtime/ukuran berubah
+    entry = _versions.get(path)
+    if entry is None or entry[0] != signature:
+        entry = (signature, _file_hash(path))
+        _versions[path] = entry
+    return entry
+
+
+def _load(table, reader, path, columns):
+    with span(f"load.{table}") as s:
+        version, df = _load_entry(table, reader, path, columns)
+        s.result(df)
+        return version, df
+
+
+def _load_entry(table, reader, path, columns):
+    if not os.path.exists(path):
+        # File lokal tidak ada: ambil dari GitHub sekali per proses
+        key = (table, REMOTE_URL, columns)
+        with _lock:
+            entry = _cache.get(key)
+            cache_event("data", entry is not None)
+            if entry is None:
+                entry = (None, "remote", reader(REMOTE_URL, columns))
+                _cache[key] = entry
+        return entry[1], entry[2]
+
+    key = (table, path, columns)
+    signature = _file_signature(path)
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == signature:
+        cache_event("data", True)
+        return entry[1], entry[2]
+
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == signature:
+            cache_event("data", True)
+            return entry[1], entry[2]
+        digest = _version(path, signature)[1]
+        if entry is not None and entry[1] == digest:
+            # Hanya mtime yang berubah (mis. file di-touch), isi tetap sama
+            cache_event("data", True)
+            df = entry[2]
+        else:
+            cache_event("data", False)
+            df = _read(table, reader, path, columns)
+        _cache[key] = (signature, digest, df)
+        return digest, df
+
+
+def cached_for_version(name, build, path=LOCAL_PATH):
+    """Memoisasi ``build()`` per (name, path) selama versi data tidak berubah.
+
+    Dipakai untuk struktur turunan (rollup cube, indeks seleksi) yang cukup
+    dibangun sekali per versi data dan dipakai bersama oleh semua sesi.
+    """
+    with span(f"derived.{name}") as s:
+        return s.result(_cached_entry(name, build, path))
+
+
+def _cached_entry(name, build, path):
+    version = data_version(path)
+    key = (name, path)
+    entry = _derived.get(key)
+    if entry is not None and entry[0] == version:
+        cache_event("derived", True)
+        return entry[1]
+    with _derived_lock:
+        entry = _derived.get(key)
+        hit = entry is not None and entry[0] == version
+        cache_event("derived", hit)
+        if not hit:
+            entry = (version, build())
+            _derived[key] = entry
+        return entry[1]
+
+
+def apply_delta(path, write, update_table, update_derived):
+    """Menambahkan data ke ``path`` lewat ``write()`` lalu memperbarui cache tanpa membaca ulang file.
+
+    ``update_table(table, columns, df)`` dan ``update_derived(name, value)``
+    menerima isi cache versi lama dan mengembalikan isi untuk versi baru, atau
+    None bila entri tersebut cukup dibuang (dibangun ulang saat diminta).
+    Selama pembaruan kedua lock dipegang, sehingga sesi lain tidak sempat
+    membangun ulang cache dari file yang baru setengah diproses.
+    """
+    with _derived_lock, _lock:
+        old = data_version(path)
+        size = os.path.getsize(path)
+        write()
+        signature = _file_signature(path)
+        if signature[1] >= size:
+            new = _chained_hash(old, path, size)
+            _versions[path] = (signature, new)
+        else:
+            # write() tidak hanya menambahkan: hash ulang seluruh file
+            new = _version(path, signature)[1]
+        for key, entry in list(_cache.items()):
+            if key[1] != path:
+                continue
+            df = update_table(key[0], key[2], entry[2]) if entry[1] == old else None
+            if df is None:
+                del _cache[key]
+            else:
+                _cache[key] = (signature, new, df)
+        for key, entry in list(_derived.items()):
+            if key[1] != path:
+                continue
+            value = update_derived(key[0], entry[1]) if entry[0] == old else None
+            if value is None:
+                del _derived[key]
+            else:
+                _derived[key] = (new, value)
+        return new
+
+
+def clear_cache():
+    with _lock:
+        _cache.clear()
+        _versions.clear()
+    with _derived_lock:
+        _derived.clear()
@@ -0,0 +1,57 @@
+"""Model data ternormalisasi: dimensi hari + tabel fakta per jam.
+
+all_data.csv adalah hasil outer merge day_df x hour_df di notebook, sehingga
+17 kolom DAY_* tersalin ke setiap baris jam (~24 baris per hari). Di sini data
+dipisah lagi menjadi dua tabel tanpa kolom duplikat:
+
+- tabel hari  : satu baris per tanggal (``DAY_dteday``), kolom DAY_* tanpa prefix
+- tabel jam   : satu baris per jam, kolom ``dteday`` + HOUR_*
+
+Halaman 1 memakai tabel hari (731 baris), halaman 2 memakai tabel jam.
+Gabungan keduanya hanya dibuat bila diminta lewat ``join_on_date``.
+"""
+from data_loader import DTYPES, LOCAL_PATH, load_table, read_all_data
+
+
+DAY_KEY = "DAY_dteday"
+HOUR_KEY = "dteday"
+
+# Kolom tiap tabel (nama setelah prefix DAY_ dihapus)
+DAY_COLUMNS = [DAY_KEY] + [col.replace("DAY_", "") for col in DTYPES if col.startswith("DAY_")]
+HOUR_COLUMNS = [HOUR_KEY] + [col for col in DTYPES if col.startswith("HOUR_")]
+
+
+def _with_key(key, columns):
+    if not columns:
+        return None
+    return list(columns) if key in columns else [key] + list(columns)
+
+
+def read_day_table(source, columns=None):
+    """Membaca tabel hari dari all_data.csv (satu baris per tanggal)."""
+    df = read_all_data(source, _with_key(DAY_KEY, columns) or DAY_COLUMNS)
+    # Baris terakhir per tanggal yang berlaku: ingest.py menambahkan baris dengan atribut hari terbaru
+    df = df.dropna(subset=[DAY_KEY]).drop_duplicates(DAY_KEY, keep="last").sort_values(DAY_KEY, kind="stable").reset_index(drop=True)
+    return df[list(columns)] if columns else df
+
+
+def read_hour_table(source, columns=None):
+    """Membaca tabel jam dari all_data.csv (tanpa kolom DAY_*)."""
+    df = read_all_data(source, _with_key(HOUR_KEY, columns) or HOUR_COLUMNS)
+    df = df.dropna(subset=[HOUR_KEY]).reset_index(drop=True)
+    return df[list(columns)] if columns else df
+
+
+def load_day_table(columns=None, path=LOCAL_PATH):
+    return load_table("day_table", read_day_table, path, columns)
+
+
+def load_hour_table(columns=None, path=LOCAL_PATH):
+    return load_table("hour_table", read_hour_table, path, columns)
+
+
+def join_on_date(hour_columns, day_columns, path=LOCAL_PATH):
+    """Menggabungkan kolom jam dengan atribut hari yang sesuai, hanya saat dibutuhkan."""
+    hour_df = load_hour_table(_with_key(HOUR_KEY, hour_columns), path)
+    day_df = load_day_table(_with_key(DAY_KEY, day_columns), path)
+    return hour_df.merge(day_df, left_on=HOUR_KEY, right_on=DAY_KEY, how="left")
@@ -0,0 +1,185 @@
+"""Cache gambar grafik yang sudah dirender (PNG) dengan eviksi LRU.
+
+Setiap rerun Streamlit membuat figure matplotlib baru lalu merasterisasinya,
+padahal pilihan filter hanya 5 musim dan 3 jenis pengguna. Cache ini
+menyimpan byte PNG per (jenis grafik, pilihan filter, versi data), dibatasi
+total ukuran byte, dan selalu menutup figure setelah dirasterisasi sehingga
+memori tetap datar walaupun server hidup lama.
+
+Grafik yang belum ada di cache dirender paralel di pool thread berukuran
+tetap (``DASHBOARD_RENDER_WORKERS``, default min(4, jumlah CPU)) yang dipakai
+bersama semua sesi, sehingga lonjakan sesi tidak membuat thread baru tanpa
+batas. Figure dibuat lewat API ``Figure`` (lihat charts.py), bukan pyplot.
+"""
+import contextvars
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import cache_event, gauge, span
+
+
+# Sama dengan pengaturan default st.pyplot
+SAVEFIG_KWARGS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}
+# Lebar maksimum gambar di st.image (MAXIMUM_CONTENT_WIDTH Streamlit); gambar
+# yang lebih lebar diperkecil Streamlit pada SETIAP rerun, jadi dilakukan sekali di sini
+MAX_IMAGE_WIDTH = 2 * 730
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+RENDER_WORKERS = int(os.environ.get("DASHBOARD_RENDER_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def _shrink(image):
+    from PIL import Image
+
+    pil_image = Image.open(io.BytesIO(image))
+    width, height = pil_image.size
+    if width <= MAX_IMAGE_WIDTH:
+        return image
+    pil_image = pil_image.resize((MAX_IMAGE_WIDTH, int(1.0 * height * MAX_IMAGE_WIDTH / width)), resample=Image.BILINEAR)
+    buffer = io.BytesIO()
+    pil_image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def rasterize(fig):
+    """Merender figure ke byte PNG (selebar maksimum st.image) lalu menutupnya."""
+    try:
+        with span("render.rasterize") as s:
+            buffer = io.BytesIO()
+            fig.savefig(buffer, **SAVEFIG_KWARGS)
+            s.bytes = buffer.tell()
+    finally:
+        if fig.canvas.manager is not None:
+            # Figure lama yang dibuat lewat pyplot masih terdaftar di pyplot
+            import matplotlib.pyplot as plt
+
+            plt.close(fig)
+        else:
+            fig.clear()
+    return _shrink(buffer.getvalue())
+
+
+class FigureCache:
+    """LRU berbatas ukuran byte untuk gambar grafik, aman dipakai banyak thread."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            image = self._entries.get(key)
+            if image is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        cache_event("figure", image is not None)
+        return image
+
+    def put(self, key, image):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= len(old)
+            self._entries[key] = image
+            self.bytes += len(image)
+            # Buang entri yang paling lama tidak dipakai sampai muat
+            while self.bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+    def get_or_render(self, key, render):
+        """Mengembalikan PNG dari cache, atau memanggil ``render()`` (-> Figure/PNG/None) bila belum ada."""
+        image = self.get(key)
+        if image is not None:
+            return image
+        fig = render()
+        if fig is None:
+            return None
+        image = fig if isinstance(fig, bytes) else rasterize(fig)
+        self.put(key, image)
+        return image
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Satu cache per proses, dipakai bersama oleh semua sesi
+figure_cache = FigureCache()
+gauge("dashboard_figure_cache_bytes", "Ukuran PNG di cache grafik (byte).", lambda: figure_cache.bytes)
+gauge("dashboard_figure_cache_evictions", "Jumlah PNG yang dibuang dari cache grafik.", lambda: figure_cache.evictions)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _render_pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=RENDER_WORKERS, thread_name_prefix="render")
+        return _executor
+
+
+def _render_job(cache, name, key, render):
+    with span(f"render.{name}") as s:
+        try:
+            fig = render()
+            if fig is None:
+                return None
+            # render() boleh langsung mengembalikan PNG (mis. hasil pre-render di disk)
+            image = fig if isinstance(fig, bytes) else rasterize(fig)
+        except Exception as e:
+            return e
+        cache.put(key, image)
+        return s.result(image)
+
+
+def render_many(jobs, cache=figure_cache):
+    """Merender banyak grafik sekaligus: ``{nama: (kunci, render)}`` -> ``{nama: PNG/None/Exception}``.
+
+    Grafik yang sudah ada di cache langsung dikembalikan; sisanya dirender paralel
+    di pool bersama. Exception dari ``render()`` dikembalikan (bukan dilempar)
+    agar halaman bisa menampilkan pesan per grafik.
+    """
+    results = {}
+    pending = {}
+    for name, (key, render) in jobs.items():
+        with span(f"figure_cache.{name}") as s:
+            image = s.result(cache.get(key))
+        if image is not None:
+            results[name] = image
+        else:
+            pending[name] = (key, render)
+    if RENDER_WORKERS <= 1 or len(pending) <= 1:
+        for name, (key, render) in pending.items():
+            results[name] = _render_job(cache, name, key, render)
+    else:
+        # Salinan context per job agar span di thread render masuk ke waterfall rerun ini (lihat metrics.py)
+        futures = {name: _render_pool().submit(contextvars.copy_context().run, _render_job, cache, name, key, render)
+                   for name, (key, render) in pending.items()}
+        for name, future in futures.items():
+            results[name] = future.result()
+    return {name: results[name] for name in jobs}
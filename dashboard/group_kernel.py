@@ -0,0 +1,149 @@
+"""Kernel agregasi per kelompok dengan ``np.bincount`` (pengganti pandas groupby).
+
+Semua dimensi dashboard adalah bilangan bulat kecil dan rapat (4 musim, 7 hari,
+24 jam, tahun, hari kerja, cuaca). Kombinasi dimensi diubah menjadi satu kunci
+bilangan bulat (mixed-radix atas kode ``nilai - minimum``, seperti
+``np.ravel_multi_index``), lalu:
+
+- count : ``np.bincount(kunci)``
+- sum   : ``np.bincount(kunci, weights=nilai)``; bobot float64 eksak selama
+          ``max |nilai| x jumlah baris < 2**53``, selain itu ``np.add.at`` int64
+- min/max : ``np.minimum.at`` / ``np.maximum.at``
+
+Tanpa hashing dan tanpa sort, jadi biayanya linear terhadap jumlah baris.
+Hasilnya sama persis dengan ``df.groupby(dimensi, sort=True)[measure].agg(...)``
+(urutan sel, dtype dimensi, int64 untuk agregat). Kolom bukan bilangan bulat,
+data kosong, atau ruang kunci lebih dari ``MAX_CELLS`` sel tidak didukung:
+fungsi mengembalikan None dan pemanggil memakai pandas.
+
+Masukan berupa DataFrame atau mapping nama -> array, termasuk kolom
+memory-mapped dari ``write_columns``/``open_columns`` (satu berkas ``.npy`` per
+kolom), sehingga agregat bisa dihitung tanpa memuat tabel ke memori.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+
+AGGREGATES = ["sum", "count", "min", "max"]
+# Batas ruang kunci (jumlah sel) agar array bincount tetap kecil
+MAX_CELLS = 1 << 22
+# Penjumlahan float64 eksak untuk bilangan bulat selama totalnya di bawah 2**53
+EXACT_FLOAT = 2 ** 53
+
+
+def _integer(array):
+    return np.issubdtype(array.dtype, np.integer)
+
+
+def group_keys(columns):
+    """(kunci gabungan per baris, [minimum], [ukuran]) untuk kolom dimensi bilangan bulat, atau None."""
+    lows, sizes = [], []
+    cells = 1
+    for column in columns:
+        if not _integer(column):
+            return None
+        low = int(column.min())
+        size = int(column.max()) - low + 1
+        cells *= size
+        if cells > MAX_CELLS:
+            return None
+        lows.append(low)
+        sizes.append(size)
+    # Kunci mixed-radix dihitung in-place (sama dengan np.ravel_multi_index tanpa array sementara)
+    key = np.zeros(len(columns[0]), dtype=np.intp)
+    for column, low, size in zip(columns, lows, sizes):
+        key *= size
+        key += column
+        key -= low
+    return key, lows, sizes
+
+
+def _sum(key, values, cells):
+    bound = max(abs(int(values.min())), abs(int(values.max()))) * len(values)
+    if bound < EXACT_FLOAT:
+        return np.bincount(key, weights=values, minlength=cells).astype(np.int64)
+    total = np.zeros(cells, dtype=np.int64)
+    np.add.at(total, key, values.astype(np.int64))
+    return total
+
+
+def _extreme(ufunc, start, key, values, cells):
+    result = np.full(cells, start, dtype=np.int64)
+    ufunc.at(result, key, values.astype(np.int64))
+    return result
+
+
+def _reduce(columns, dimensions, measures, aggregates):
+    # ({dimensi: nilai per sel}, {measure_agg: nilai per sel}) untuk sel yang terisi, atau None
+    dims = [np.asarray(columns[name]) for name in dimensions]
+    values = {name: np.asarray(columns[name]) for name in measures}
+    if not len(dims[0]) or not all(_integer(array) for array in values.values()):
+        return None
+    keys = group_keys(dims)
+    if keys is None:
+        return None
+    key, lows, sizes = keys
+    cells = int(np.prod(sizes))
+    count = np.bincount(key, minlength=cells)
+    present = np.flatnonzero(count)
+    cell_dims = {name: (code + low).astype(array.dtype)
+                 for name, array, code, low in zip(dimensions, dims, np.unravel_index(present, sizes), lows)}
+    result = {}
+    for name, array in values.items():
+        for agg in aggregates:
+            if agg == "sum":
+                column = _sum(key, array, cells)
+            elif agg == "count":
+                column = count
+            elif agg == "min":
+                column = _extreme(np.minimum, np.iinfo(np.int64).max, key, array, cells)
+            elif agg == "max":
+                column = _extreme(np.maximum, np.iinfo(np.int64).min, key, array, cells)
+            else:
+                raise ValueError(f"Agregat tidak dikenal: {agg}")
+            result[f"{name}_{agg}"] = column[present].astype(np.int64)
+    return cell_dims, result
+
+
+def aggregate(columns, dimensions, measures, aggregates=AGGREGATES):
+    """Agregat ``{measure}_{agg}`` per kombinasi ``dimensions`` (satu baris per sel yang terisi).
+
+    Sama dengan ``build_cube`` versi pandas; None bila masukan tidak didukung.
+    """
+    reduced = _reduce(columns, dimensions, measures, aggregates)
+    if reduced is None:
+        return None
+    cell_dims, result = reduced
+    return pd.DataFrame({**cell_dims, **result})
+
+
+def sum_by(df, dimensions, columns):
+    """``df.groupby(dimensions)[columns].sum()`` lewat bincount (pandas bila tidak didukung)."""
+    reduced = _reduce(df, dimensions, columns, ["sum"])
+    if reduced is None:
+        return df.groupby(dimensions if len(dimensions) > 1 else dimensions[0])[columns].sum()
+    cell_dims, result = reduced
+    if len(dimensions) == 1:
+        index = pd.Index(cell_dims[dimensions[0]], name=dimensions[0])
+    else:
+        index = pd.MultiIndex.from_arrays(list(cell_dims.values()), names=dimensions)
+    return pd.DataFrame({name: result[f"{name}_sum"] for name in columns}, index=index)
+
+
+# --- Kolom memory-mapped -------------------------------------------------------
+
+def write_columns(df, directory):
+    """Menyimpan setiap kolom ``df`` sebagai ``<kolom>.npy`` di ``directory``."""
+    os.makedirs(directory, exist_ok=True)
+    for name in df.columns:
+        tmp = os.path.join(directory, f"{name}.tmp.npy")
+        np.save(tmp, df[name].to_numpy())
+        os.replace(tmp, os.path.join(directory, f"{name}.npy"))
+    return directory
+
+
+def open_columns(directory, columns):
+    """``{kolom: array memory-mapped (read-only)}`` dari berkas ``write_columns``."""
+    return {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in columns}
@@ -0,0 +1,329 @@
+"""Ingest inkremental baris per jam baru (skema ``data/hour.csv``) ke all_data.csv.
+
+Baris baru diproses seperti di notebook (nama kolom HOUR_*, pemangkasan
+outlier ``casual``/``windspeed`` ke batas atas IQR, ``season_new``), digabung
+dengan atribut harinya, lalu DITAMBAHKAN ke akhir all_data.csv. Tidak ada
+clean -> clip -> merge -> to_csv ulang atas seluruh riwayat.
+
+Atribut hari (DAY_*) untuk tanggal baru diturunkan dari baris jamnya (jumlah
+penyewaan, rata-rata cuaca). Bila tanggalnya sudah ada, baris baru membawa
+atribut hari lama dengan jumlah penyewaan yang sudah ditambah; tabel hari
+selalu memakai baris terakhir per tanggal (lihat data_model.py).
+
+Cache proses dashboard (tabel, rollup cube, indeks seleksi, kuantil box plot) diperbarui dengan
+delta lewat ``data_loader.apply_delta``, sehingga dashboard melihat data baru
+pada rerun berikutnya tanpa memuat ulang seluruh file::
+
+    python dashboard/ingest.py baris_baru.csv [...]
+    python dashboard/ingest.py --watch folder_masuk [--interval 5]
+    python dashboard/ingest.py --check [--days 5]
+
+``--check`` menjalankan ``check_incremental``: jalur inkremental dibandingkan
+dengan pemuatan penuh pada salinan all_data.csv.
+
+Dashboard menjalankan watcher di thread latar bila ``DASHBOARD_INGEST_DIR`` di-set.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_loader import DATE_FORMAT, DTYPES, LOCAL_PATH, apply_delta, prepare_all_data
+from data_model import DAY_KEY, HOUR_KEY, load_day_table, load_hour_table
+from quantiles import QUANTILE_COLUMNS, update_month_cells
+from rollup import DAY_DIMENSIONS, DAY_MEASURES, HOUR_DIMENSIONS, HOUR_MEASURES, SEASON_NAMES, update_cube
+from selection_index import splice_sorted
+
+
+# Kolom data/hour.csv
+HOUR_SOURCE_COLUMNS = ["instant", "dteday", "season", "yr", "mnth", "hr", "holiday", "weekday", "workingday",
+                       "weathersit", "temp", "atemp", "hum", "windspeed", "casual", "registered", "cnt"]
+# Batas atas IQR (Q3 + 1.5 * IQR) dari notebook, dihitung pada hour.csv 2011-2012.
+# Dibekukan agar baris baru dipangkas sama persis dengan riwayat yang sudah ada.
+CLIP_UPPER = {"casual": 114, "windspeed": 0.4775}
+DAY_COUNTS = ["casual", "registered", "total_rentals"]
+DAY_WEATHER = ["temp", "atemp", "hum", "windspeed"]
+
+logger = logging.getLogger(__name__)
+
+_append_lock = threading.Lock()
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def read_hour_rows(source):
+    """Membaca baris baru berskema hour.csv; ValueError bila kolomnya tidak lengkap."""
+    rows = pd.read_csv(source)
+    missing = [col for col in HOUR_SOURCE_COLUMNS if col not in rows.columns]
+    if missing:
+        raise ValueError(f"Kolom {missing} tidak ditemukan pada {source}.")
+    return rows[HOUR_SOURCE_COLUMNS]
+
+
+def prepare_hours(rows):
+    """Baris hour.csv -> kolom jam all_data (prefix HOUR_, kolom hasil pemangkasan outlier)."""
+    hours = rows.rename(columns={col: f"HOUR_{col}" for col in HOUR_SOURCE_COLUMNS if col != "dteday"})
+    hours["dteday"] = pd.to_datetime(hours["dteday"], format=DATE_FORMAT)
+    hours["HOUR_windspeed_replaced_upper"] = hours["HOUR_windspeed"].clip(upper=CLIP_UPPER["windspeed"])
+    hours["HOUR_casual_replaced_upper"] = hours["HOUR_casual"].clip(upper=CLIP_UPPER["casual"])
+    return hours.sort_values([HOUR_KEY, "HOUR_hr"], kind="stable").reset_index(drop=True)
+
+
+def day_records(hours, day_table):
+    """Atribut hari (kolom DAY_*) untuk setiap tanggal di ``hours``.
+
+    Tanggal yang sudah ada: atribut lama + jumlah penyewaan baru. Tanggal
+    baru: diturunkan dari baris jamnya, dengan ``instant`` lanjutan.
+    """
+    sums = hours.groupby(HOUR_KEY)[["HOUR_casual", "HOUR_registered", "HOUR_cnt"]].sum()
+    sums.columns = DAY_COUNTS
+    known = day_table.set_index(DAY_KEY)
+    old = known.reindex(sums.index[sums.index.isin(known.index)])
+    updated = old.copy()
+    updated[DAY_COUNTS] = old[DAY_COUNTS].astype("int64") + sums.loc[old.index]
+
+    new_dates = sums.index[~sums.index.isin(known.index)]
+    first = hours.groupby(HOUR_KEY).first().loc[new_dates]
+    next_instant = int(known["instant"].max()) + 1 if len(known) else 1
+    new = pd.DataFrame({
+        "instant": range(next_instant, next_instant + len(new_dates)),
+        "season": first["HOUR_season"], "yr": first["HOUR_yr"], "mnth": first["HOUR_mnth"],
+        "holiday": first["HOUR_holiday"], "weekday": first["HOUR_weekday"], "workingday": first["HOUR_workingday"],
+        "weathersit": hours.groupby(HOUR_KEY)["HOUR_weathersit"].agg(lambda s: s.mode().iloc[0]).loc[new_dates],
+    }, index=new_dates)
+    for col in DAY_WEATHER:
+        new[col] = hours.groupby(HOUR_KEY)[f"HOUR_{col}"].mean().loc[new_dates].round(6)
+    new[DAY_COUNTS] = sums.loc[new_dates]
+    new["season_new"] = new["season"].map(SEASON_NAMES)
+
+    days = pd.concat([updated, new])
+    days[DAY_WEATHER] = days[DAY_WEATHER].astype("float64").round(6)
+    days = days.rename(columns={col: f"DAY_{col}" for col in days.columns})
+    days.index.name = DAY_KEY
+    return days.reset_index(), old.reset_index()
+
+
+def _append_csv(path, delta):
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    delta.to_csv(path, mode="a", header=False, index=False, date_format=DATE_FORMAT)
+
+
+def _table_updater(delta):
+    def update(table, columns, df):
+        if table in ("all_data", "hour_table"):
+            return pd.concat([df, delta[list(columns) if columns else df.columns]], ignore_index=True)
+        if table == "day_table" and DAY_KEY in df.columns:
+            # Tabel hari terurut per tanggal: hari baru/berubah disisipkan, hanya ekornya yang diurutkan ulang
+            days = delta.drop_duplicates(DAY_KEY, keep="last")[df.columns]
+            return splice_sorted(df, df[DAY_KEY].to_numpy(), [0, len(df)], days, np.zeros(len(days), dtype=np.int64), DAY_KEY)[0]
+        return None
+    return update
+
+
+def _derived_updater(delta, old_days, path):
+    new_days = delta.drop_duplicates(DAY_KEY, keep="last")
+
+    def update(name, value):
+        if name == "hour_cube":
+            return update_cube(value, HOUR_DIMENSIONS, HOUR_MEASURES, delta)
+        if name == "day_cube":
+            return update_cube(value, DAY_DIMENSIONS, DAY_MEASURES, new_days, old_days,
+                               rows=lambda: load_day_table(None, path))
+        # Indeks seleksi: baris baru disisipkan ke slice selnya (lihat selection_index.splice_sorted)
+        if name == "day_index":
+            return value.extend(new_days)
+        if name == "hour_index":
+            return value.extend(delta)
+        # Kuantil: hanya sel bulan yang mendapat hari baru/berubah yang disusun ulang;
+        # ringkasan per musim dibuang dan digabung ulang dari sel saat diminta
+        if name == "day_quantiles":
+            return update_month_cells(value, load_day_table(QUANTILE_COLUMNS, path), new_days[DAY_KEY])
+        return None
+    return update
+
+
+def append_hours(rows, path=LOCAL_PATH):
+    """Menambahkan baris jam baru (skema hour.csv) ke all_data; mengembalikan jumlah baris yang ditambahkan.
+
+    Baris dengan (tanggal, jam) yang sudah ada dilewati, sehingga file yang
+    sama aman di-ingest dua kali.
+    """
+    with _append_lock:
+        hours = prepare_hours(rows)
+        existing = load_hour_table([HOUR_KEY, "HOUR_hr"], path)
+        existing = existing[existing[HOUR_KEY].isin(hours[HOUR_KEY].unique())]
+        seen = pd.MultiIndex.from_frame(existing[[HOUR_KEY, "HOUR_hr"]])
+        hours = hours[~pd.MultiIndex.from_frame(hours[[HOUR_KEY, "HOUR_hr"]]).isin(seen)]
+        hours = hours.drop_duplicates([HOUR_KEY, "HOUR_hr"], keep="last")
+        if hours.empty:
+            return 0
+
+        days, old_days = day_records(hours, load_day_table(None, path))
+        with open(path, encoding="utf-8") as f:
+            header = f.readline().strip().split(",")
+        raw = hours.merge(days, left_on=HOUR_KEY, right_on=DAY_KEY, how="left")[header]
+        raw = raw.astype({col: dtype for col, dtype in DTYPES.items() if col in raw.columns})
+        delta = prepare_all_data(raw)
+
+        apply_delta(path, lambda: _append_csv(path, raw),
+                    _table_updater(delta), _derived_updater(delta, old_days, path))
+        return len(raw)
+
+
+def ingest_file(source, path=LOCAL_PATH):
+    return append_hours(read_hour_rows(source), path)
+
+
+def _ready_files(directory, settle):
+    now = time.time()
+    for name in sorted(os.listdir(directory)):
+        full = os.path.join(directory, name)
+        # Berkas yang baru saja diubah mungkin masih sedang ditulis
+        if name.endswith(".csv") and os.path.isfile(full) and now - os.path.getmtime(full) >= settle:
+            yield name, full
+
+
+def poll(directory, path=LOCAL_PATH, settle=1.0):
+    """Meng-ingest semua CSV di ``directory`` lalu memindahkannya ke ``processed/`` (atau ``failed/``)."""
+    total = 0
+    for name, full in _ready_files(directory, settle):
+        try:
+            added = ingest_file(full, path)
+            target = "processed"
+            logger.info("%s: %d baris ditambahkan", name, added)
+            total += added
+        except Exception:
+            target = "failed"
+            logger.exception("%s: gagal di-ingest, dipindah ke failed/", name)
+        os.makedirs(os.path.join(directory, target), exist_ok=True)
+        os.replace(full, os.path.join(directory, target, name))
+    return total
+
+
+def watch(directory, path=LOCAL_PATH, interval=5.0, stop=None):
+    """Memeriksa ``directory`` setiap ``interval`` detik sampai ``stop`` (threading.Event) di-set."""
+    stop = stop or threading.Event()
+    while not stop.is_set():
+        poll(directory, path, settle=min(interval, 1.0))
+        stop.wait(interval)
+
+
+def start_watcher(directory, path=LOCAL_PATH, interval=5.0):
+    """Menjalankan ``watch`` di thread latar, sekali per (folder, file data) per proses."""
+    with _watchers_lock:
+        key = (os.path.abspath(directory), path)
+        if key not in _watchers:
+            os.makedirs(directory, exist_ok=True)
+            thread = threading.Thread(target=watch, args=(directory, path, interval), name="ingest-watcher", daemon=True)
+            thread.start()
+            _watchers[key] = thread
+        return _watchers[key]
+
+
+def _derived_state(path):
+    # Semua struktur yang diperbarui apply_delta, dalam bentuk yang bisa dibandingkan
+    from quantiles import box_stats_frame, load_month_quantiles, load_season_quantiles
+    from rollup import load_day_cube, load_hour_cube
+    from selection_index import load_day_index, load_hour_index
+
+    day_index, hour_index = load_day_index(path), load_hour_index(path)
+    return {
+        "day_table": load_day_table(None, path),
+        "hour_table": load_hour_table(None, path),
+        "day_cube": load_day_cube(path),
+        "hour_cube": load_hour_cube(path),
+        "day_index": day_index.day,
+        "day_index.offsets": day_index.offsets,
+        "day_index.cumsum": day_index.cumsum,
+        "hour_index": hour_index.hour,
+        "hour_index.offsets": hour_index.offsets,
+        **{f"hour_index.cumsum.{measure}": cumsum for measure, cumsum in hour_index.cumsums.items()},
+        "month_quantiles": box_stats_frame({str(key): summary for key, summary in load_month_quantiles(path).items()}),
+        "season_quantiles": box_stats_frame({str(key): summary for key, summary in load_season_quantiles(path).items()}),
+    }
+
+
+def check_incremental(path=LOCAL_PATH, days=5, batches=3, overlap=12):
+    """Membandingkan jalur ingest inkremental dengan pemuatan penuh; AssertionError bila beda.
+
+    ``days`` tanggal terakhir dihapus dari salinan ``path`` dan semua cache
+    salinan dibangun. Baris jamnya lalu di-ingest ulang dalam ``batches``
+    potongan yang saling tumpang tindih ``overlap`` baris (tanggal terpecah
+    antar potongan, (tanggal, jam) yang sudah ada dilewati), ditambah satu
+    ingest ulang semuanya yang harus menambahkan 0 baris. Tabel, cube, indeks
+    seleksi dan sel kuantil hasil pembaruan harus sama dengan pemuatan ulang
+    salinan dari nol; cube jam dan total per tanggal juga harus sama dengan
+    ``path`` asli. Mengembalikan jumlah baris yang di-ingest ulang.
+    """
+    import tempfile
+
+    from data_loader import clear_cache
+    from rollup import load_hour_cube
+
+    source = pd.read_csv(path, usecols=[HOUR_KEY] + [f"HOUR_{col}" for col in HOUR_SOURCE_COLUMNS if col != "dteday"])
+    dropped = source[HOUR_KEY].isin(sorted(source[HOUR_KEY].dropna().unique())[-days:]).to_numpy()
+    rows = source[dropped].rename(columns=lambda col: col.replace("HOUR_", "", 1))[HOUR_SOURCE_COLUMNS].reset_index(drop=True)
+    bounds = np.linspace(0, len(rows), batches + 1).astype(int)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = os.path.join(tmp, os.path.basename(path))
+        with open(path, encoding="utf-8") as f, open(copy, "w", encoding="utf-8") as out:
+            out.write(f.readline())
+            out.writelines(line for line, drop in zip(f, dropped) if not drop)
+        _derived_state(copy)
+
+        added = sum(append_hours(rows.iloc[max(0, a - overlap):b], copy) for a, b in zip(bounds[:-1], bounds[1:]))
+        assert added == len(rows), f"{added} baris ditambahkan, seharusnya {len(rows)}"
+        assert append_hours(rows, copy) == 0, "ingest ulang menambahkan baris duplikat"
+        incremental = _derived_state(copy)
+        clear_cache()
+        full = _derived_state(copy)
+        for name, expected in full.items():
+            if isinstance(expected, pd.DataFrame):
+                pd.testing.assert_frame_equal(incremental[name], expected, check_exact=True, obj=name)
+            else:
+                np.testing.assert_array_equal(incremental[name], expected, err_msg=name)
+
+        pd.testing.assert_frame_equal(full["hour_cube"], load_hour_cube(path), check_exact=True, obj="hour_cube (asli)")
+        totals = load_day_table([DAY_KEY, "total_rentals"], path).set_index(DAY_KEY)["total_rentals"]
+        pd.testing.assert_series_equal(full["day_table"].set_index(DAY_KEY)["total_rentals"], totals, check_exact=True)
+        clear_cache()
+    return len(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*", help="CSV berskema hour.csv")
+    parser.add_argument("--watch", metavar="FOLDER", help="pantau folder untuk CSV baru")
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument("--check", action="store_true", help="bandingkan jalur inkremental dengan pemuatan penuh")
+    parser.add_argument("--days", type=int, default=5, help="jumlah tanggal terakhir yang di-ingest ulang untuk --check")
+    args = parser.parse_args(argv)
+
+    if args.check:
+        start = time.perf_counter()
+        count = check_incremental(days=args.days)
+        print(f"{args.days} hari ({count} baris) di-ingest ulang dalam potongan tumpang tindih: "
+              f"tabel, cube, indeks dan kuantil sama persis dengan pemuatan penuh ({time.perf_counter() - start:.1f} s).")
+
+    for source in args.files:
+        start = time.perf_counter()
+        added = ingest_file(source)
+        print(f"{source}: {added} baris ditambahkan ({(time.perf_counter() - start) * 1000:.0f} ms)")
+    if args.watch:
+        # Pesan poll() (logger modul ini) ditampilkan di terminal
+        logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+        watch(args.watch, interval=args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""Instrumentasi jalur panas dashboard: durasi, baris, byte, dan cache hit/miss.
+
+Pemuatan data, konversi tipe, fungsi filter, pembuat grafik ``create_*`` dan
+rasterisasi dibungkus ``span`` (atau dekorator ``instrument``). Setiap span
+yang selesai dicatat ke:
+
+- agregat per proses (counter per nama span) dalam format teks Prometheus,
+  lewat ``prometheus_text``; dashboard menulisnya ke ``DASHBOARD_METRICS_FILE``
+  setiap rerun dan/atau menyajikannya di ``http://<host>:DASHBOARD_METRICS_PORT/metrics``
+- log terstruktur (satu JSON per span, logger ``dashboard.metrics`` level INFO);
+  ``DASHBOARD_METRICS_LOG=-`` menulis ke stderr, nilai lain = path berkas
+- waterfall per rerun, hanya bila sedang direkam dengan ``recording()`` (panel
+  debug sidebar, ``DASHBOARD_DEBUG_PANEL=1``)
+
+``rows``/``bytes`` adalah jumlah baris dan ukuran hasil span (DataFrame,
+Series, array, PNG), bukan total alokasi sementara. Menghitung byte DataFrame
+relatif mahal (~0,1 ms), jadi hanya dilakukan bila metrik diekspor (salah satu
+variabel lingkungan di atas di-set) atau panel debug sedang merekam. Selain
+itu biaya satu span hanya beberapa mikrodetik.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+
+
+logger = logging.getLogger("dashboard.metrics")
+
+_trace = contextvars.ContextVar("dashboard_metrics_trace", default=None)
+_current = contextvars.ContextVar("dashboard_metrics_span", default=None)
+_lock = threading.Lock()
+# nama span -> [panggilan, detik, baris, byte, error]
+_totals = {}
+# (nama cache, "hit"/"miss") -> jumlah
+_cache_totals = {}
+# nama metrik -> (keterangan, fungsi -> nilai)
+_gauges = {}
+_servers = {}
+# Byte hasil dihitung untuk semua span bila metrik diekspor
+EXPORT_BYTES = any(os.environ.get(name) for name in ("DASHBOARD_METRICS_LOG", "DASHBOARD_METRICS_FILE", "DASHBOARD_METRICS_PORT"))
+
+
+def result_rows(value):
+    """Jumlah baris array/Series/DataFrame, atau None (skalar numpy punya shape kosong)."""
+    shape = getattr(value, "shape", None)
+    return shape[0] if shape else None
+
+
+def result_bytes(value):
+    """Ukuran hasil dalam byte (PNG, array, Series, DataFrame), atau None."""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if not getattr(value, "shape", None):
+        return None
+    if hasattr(value, "columns"):
+        return int(value.memory_usage(index=False).sum())
+    nbytes = getattr(value, "nbytes", None)
+    return int(nbytes) if nbytes is not None else None
+
+
+class span:
+    """Context manager yang mengukur satu langkah; ``result(value)`` mencatat baris/byte hasilnya."""
+
+    __slots__ = ("name", "rows", "bytes", "cache", "value", "start", "depth", "_token")
+
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.bytes = None
+        self.cache = None
+        self.value = None
+
+    def __enter__(self):
+        parent = _current.get()
+        self.depth = parent.depth + 1 if parent is not None else 0
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        _current.reset(self._token)
+        _record(self, seconds, exc_type is not None)
+        return False
+
+    def result(self, value):
+        rows = result_rows(value)
+        if rows is not None:
+            self.rows = rows
+        # Byte dihitung saat span selesai, hanya bila dibutuhkan (lihat _record)
+        self.value = value
+        return value
+
+
+def instrument(name):
+    """Dekorator: setiap panggilan fungsi menjadi satu span bernama ``name``.
+
+    Bila ukuran hasil tidak diketahui (mis. Figure), baris dihitung dari argumen pertama.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name) as s:
+                result = s.result(fn(*args, **kwargs))
+                if s.rows is None and args:
+                    s.rows = result_rows(args[0])
+                return result
+        return wrapper
+    return decorate
+
+
+def cache_event(cache, hit):
+    """Mencatat hit/miss sebuah cache; span yang sedang berjalan ikut ditandai."""
+    result = "hit" if hit else "miss"
+    with _lock:
+        _cache_totals[(cache, result)] = _cache_totals.get((cache, result), 0) + 1
+    current = _current.get()
+    if current is not None:
+        current.cache = result
+
+
+def _record(s, seconds, error):
+    trace = _trace.get()
+    logging_on = logger.isEnabledFor(logging.INFO)
+    if s.bytes is None and s.value is not None and (EXPORT_BYTES or trace is not None or logging_on):
+        s.bytes = result_bytes(s.value)
+    s.value = None
+    with _lock:
+        totals = _totals.get(s.name)
+        if totals is None:
+            totals = _totals[s.name] = [0, 0.0, 0, 0, 0]
+        totals[0] += 1
+        totals[1] += seconds
+        totals[2] += s.rows or 0
+        totals[3] += s.bytes or 0
+        totals[4] += error
+    if trace is not None:
+        # list.append atomik, jadi thread render boleh menambah ke trace yang sama
+        trace["spans"].append({"span": s.name, "offset": s.start - trace["start"], "seconds": seconds, "depth": s.depth,
+                               "rows": s.rows, "bytes": s.bytes, "cache": s.cache, "error": error,
+                               "thread": threading.current_thread().name})
+    if logging_on:
+        logger.info(json.dumps({"span": s.name, "seconds": round(seconds, 6), "rows": s.rows, "bytes": s.bytes,
+                                "cache": s.cache, "error": error, "thread": threading.current_thread().name}))
+
+
+@contextlib.contextmanager
+def recording(enabled=True):
+    """Merekam semua span di konteks ini (termasuk thread render) untuk waterfall; None bila tidak aktif."""
+    if not enabled:
+        yield None
+        return
+    trace = {"start": time.perf_counter(), "spans": []}
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+
+def gauge(name, help_text, read):
+    """Mendaftarkan gauge yang nilainya dibaca ``read()`` saat metrik diekspor."""
+    _gauges[name] = (help_text, read)
+
+
+def snapshot():
+    """Salinan agregat: ``{"spans": {nama: {...}}, "cache": {(cache, hasil): n}}``."""
+    with _lock:
+        spans = {name: dict(zip(("calls", "seconds", "rows", "bytes", "errors"), values)) for name, values in _totals.items()}
+        return {"spans": spans, "cache": dict(_cache_totals)}
+
+
+def reset():
+    with _lock:
+        _totals.clear()
+        _cache_totals.clear()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text():
+    """Semua metrik dalam format teks eksposisi Prometheus."""
+    data = snapshot()
+    lines = []
+    for field, metric, help_text in (("seconds", "dashboard_span_seconds_total", "Total durasi span (detik)."),
+                                     ("calls", "dashboard_span_calls_total", "Jumlah panggilan span."),
+                                     ("rows", "dashboard_span_rows_total", "Total baris hasil span."),
+                                     ("bytes", "dashboard_span_bytes_total", "Total byte hasil span."),
+                                     ("errors", "dashboard_span_errors_total", "Jumlah span yang berakhir dengan exception.")):
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+        lines += [f'{metric}{{span="{_label(name)}"}} {values[field]}' for name, values in sorted(data["spans"].items())]
+    lines += ["# HELP dashboard_cache_requests_total Permintaan cache per hasil (hit/miss).",
+              "# TYPE dashboard_cache_requests_total counter"]
+    lines += [f'dashboard_cache_requests_total{{cache="{_label(cache)}",result="{result}"}} {count}'
+              for (cache, result), count in sorted(data["cache"].items())]
+    for name, (help_text, read) in sorted(_gauges.items()):
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {read()}"]
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Menulis ``prometheus_text()`` ke berkas (atomik, untuk textfile collector node_exporter)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+
+
+def start_http_server(port, host="0.0.0.0"):
+    """Menyajikan ``/metrics`` di thread latar, sekali per port per proses."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    with _lock:
+        if port not in _servers:
+            server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+            _servers[port] = server
+        return _servers[port]
+
+
+def configure_logging(target):
+    """Mengaktifkan log terstruktur ke stderr (``"-"``) atau ke berkas ``target``."""
+    if not target or logger.handlers:
+        return
+    handler = logging.StreamHandler() if target == "-" else logging.FileHandler(target, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+configure_logging(os.environ.get("DASHBOARD_METRICS_LOG"))
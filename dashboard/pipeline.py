@@ -0,0 +1,216 @@
+"""Pipeline praproses day.csv + hour.csv -> all_data.csv (pengganti sel notebook).
+
+Langkah-langkah di notebook.ipynb dijadikan stage yang tervektorisasi:
+
+1. load   : membaca day.csv dan hour.csv
+2. type   : ``dteday`` -> datetime
+3. clip   : batas atas IQR (Q3 + 1.5 * IQR) untuk semua kolom di ``CLIP_COLUMNS``
+            dari SATU pemanggilan ``quantile([0.25, 0.75])``, lalu kolom
+            ``*_replaced_upper``
+4. derive : ``cnt`` -> ``total_rentals`` dan ``season_new`` (map, bukan apply per baris)
+5. join   : prefix DAY_/HOUR_ lalu outer merge per tanggal
+6. export : all_data.csv
+
+Hasil setiap stage disimpan di ``data/pipeline_cache/`` dengan kunci hash isi:
+kunci stage = hash(kunci stage sebelumnya + parameter stage), dan kunci stage
+pertama = hash isi file sumber. Run ulang melanjutkan dari stage terakhir yang
+kuncinya sudah ada di cache; bila semua sama, all_data.csv tidak ditulis ulang.
+all_data.csv yang diubah di luar pipeline (mis. baris tambahan dari ingest.py,
+yang tidak ikut tertulis ke data/hour.csv) tidak ditimpa tanpa ``--force``::
+
+    python dashboard/pipeline.py [--out dashboard/all_data.csv] [--force]
+
+Hasilnya identik byte-per-byte dengan all_data.csv dari notebook (lihat
+benchmarks/bench_pipeline.py untuk perbandingan waktu).
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from data_loader import DATA_DIR, DATE_FORMAT, LOCAL_PATH
+from rollup import SEASON_NAMES
+
+
+# Naikkan bila logika salah satu stage berubah agar cache lama tidak dipakai
+PIPELINE_VERSION = "1"
+
+REPO_DIR = os.path.dirname(DATA_DIR)
+
+DAY_SOURCE = os.path.join(REPO_DIR, "data", "day.csv")
+HOUR_SOURCE = os.path.join(REPO_DIR, "data", "hour.csv")
+CACHE_DIR = os.path.join(REPO_DIR, "data", "pipeline_cache")
+
+# Kolom hour.csv yang outlier-nya dipangkas ke batas atas IQR (urutan = urutan kolom baru)
+CLIP_COLUMNS = ["windspeed", "casual"]
+IQR_FACTOR = 1.5
+
+STAGES = ["load", "type", "clip", "derive", "join"]
+
+
+def _file_hash(path):
+    sha1 = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha1.update(block)
+    return sha1.hexdigest()
+
+
+def _key(*parts):
+    return hashlib.sha1(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+# --- Stage -------------------------------------------------------------------
+
+def load(day_path, hour_path):
+    return {"day": pd.read_csv(day_path), "hour": pd.read_csv(hour_path)}
+
+
+def to_types(frames):
+    frames = dict(frames)
+    for name in ("day", "hour"):
+        frames[name] = frames[name].assign(dteday=pd.to_datetime(frames[name]["dteday"], format=DATE_FORMAT))
+    return frames
+
+
+def upper_bounds(df, columns, factor=IQR_FACTOR):
+    """Batas atas IQR semua kolom sekaligus (satu kali hitung kuantil)."""
+    quartiles = df[list(columns)].quantile([0.25, 0.75])
+    q1, q3 = quartiles.loc[0.25], quartiles.loc[0.75]
+    return q3 + factor * (q3 - q1)
+
+
+def clip_outliers(frames, columns=CLIP_COLUMNS, factor=IQR_FACTOR):
+    bounds = upper_bounds(frames["hour"], columns, factor)
+    hour = frames["hour"].assign(**{f"{col}_replaced_upper": frames["hour"][col].clip(upper=bounds[col]) for col in columns})
+    return dict(frames, hour=hour, bounds=bounds)
+
+
+def derive_season(frames):
+    day = frames["day"].rename(columns={"cnt": "total_rentals"})
+    day["season_new"] = day["season"].map(SEASON_NAMES)
+    return dict(frames, day=day)
+
+
+def join(frames):
+    day = frames["day"].add_prefix("DAY_")
+    hour = frames["hour"].add_prefix("HOUR_").rename(columns={"HOUR_dteday": "dteday"})
+    return dict(frames, all_data=pd.merge(day, hour, left_on="DAY_dteday", right_on="dteday", how="outer"))
+
+
+# --- Cache -------------------------------------------------------------------
+
+def stage_keys(day_path=DAY_SOURCE, hour_path=HOUR_SOURCE, columns=CLIP_COLUMNS, factor=IQR_FACTOR):
+    """Kunci hash setiap stage (hanya butuh hash file sumber, tanpa membaca CSV)."""
+    keys = {"load": _key(PIPELINE_VERSION, "load", _file_hash(day_path), _file_hash(hour_path))}
+    keys["type"] = _key(keys["load"], "type")
+    keys["clip"] = _key(keys["type"], "clip", list(columns), factor)
+    keys["derive"] = _key(keys["clip"], "derive")
+    keys["join"] = _key(keys["derive"], "join")
+    return keys
+
+
+def _cache_path(cache_dir, stage, key):
+    return os.path.join(cache_dir, f"{stage}-{key[:16]}.pkl")
+
+
+def _export_record(cache_dir):
+    return os.path.join(cache_dir, "export.json")
+
+
+def export(all_data, out, key, cache_dir=CACHE_DIR, force=False):
+    """Menulis ``out`` bila kunci stage join berubah; mengembalikan status export.
+
+    ``out`` yang isinya berbeda dari export terakhir pipeline dianggap diubah
+    di luar pipeline dan tidak ditimpa (FileExistsError) kecuali ``force``,
+    atau bila isinya memang sama dengan hasil pipeline.
+    """
+    record = {}
+    if os.path.exists(_export_record(cache_dir)):
+        with open(_export_record(cache_dir), encoding="utf-8") as f:
+            record = json.load(f)
+    previous = record.get(os.path.abspath(out))
+    current = _file_hash(out) if os.path.exists(out) else None
+    untouched = previous is not None and current == previous["hash"]
+    if untouched and previous["key"] == key and not force:
+        return "dilewati"
+    tmp = out + ".tmp"
+    all_data.to_csv(tmp, index=False)
+    digest = _file_hash(tmp)
+    if current is not None and not untouched and digest != current and not force:
+        os.remove(tmp)
+        raise FileExistsError(f"{out} diubah di luar pipeline (mis. oleh ingest.py); gunakan --force untuk menimpanya")
+    os.replace(tmp, out)
+    record[os.path.abspath(out)] = {"key": key, "hash": digest}
+    with open(_export_record(cache_dir), "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=1)
+    return "dijalankan"
+
+
+def run(out=LOCAL_PATH, day_path=DAY_SOURCE, hour_path=HOUR_SOURCE, columns=CLIP_COLUMNS, factor=IQR_FACTOR,
+        cache_dir=CACHE_DIR, force=False):
+    """Menjalankan pipeline; mengembalikan (hasil stage terakhir, [(stage, status, detik)])."""
+    os.makedirs(cache_dir, exist_ok=True)
+    keys = stage_keys(day_path, hour_path, columns, factor)
+    steps = {
+        "load": lambda frames: load(day_path, hour_path),
+        "type": to_types,
+        "clip": lambda frames: clip_outliers(frames, columns, factor),
+        "derive": derive_season,
+        "join": join,
+    }
+    # Lanjutkan dari stage terakhir yang hasilnya sudah ada di cache
+    start = 0
+    if not force:
+        for i in reversed(range(len(STAGES))):
+            if os.path.exists(_cache_path(cache_dir, STAGES[i], keys[STAGES[i]])):
+                start = i
+                break
+    report = []
+    frames = None
+    for i, stage in enumerate(STAGES):
+        if i < start:
+            report.append((stage, "dilewati", 0.0))
+            continue
+        began = time.perf_counter()
+        path = _cache_path(cache_dir, stage, keys[stage])
+        if i == start and not force and os.path.exists(path):
+            frames = pd.read_pickle(path)
+            status = "cache"
+        else:
+            frames = steps[stage](frames)
+            pd.to_pickle(frames, path + ".tmp")
+            os.replace(path + ".tmp", path)
+            status = "dijalankan"
+        report.append((stage, status, time.perf_counter() - began))
+
+    began = time.perf_counter()
+    status = export(frames["all_data"], out, keys["join"], cache_dir, force)
+    report.append(("export", status, time.perf_counter() - began))
+    return frames, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--day", default=DAY_SOURCE)
+    parser.add_argument("--hour", default=HOUR_SOURCE)
+    parser.add_argument("--out", default=LOCAL_PATH)
+    parser.add_argument("--cache-dir", default=CACHE_DIR)
+    parser.add_argument("--clip", default=",".join(CLIP_COLUMNS), help="kolom hour.csv yang dipangkas, dipisah koma")
+    parser.add_argument("--force", action="store_true", help="abaikan cache, jalankan semua stage, timpa --out")
+    args = parser.parse_args(argv)
+
+    try:
+        frames, report = run(args.out, args.day, args.hour, args.clip.split(","), IQR_FACTOR, args.cache_dir, args.force)
+    except FileExistsError as e:
+        parser.exit(1, f"{e}\n")
+    for stage, status, seconds in report:
+        print(f"{stage:<8}{status:<12}{seconds * 1000:>8.0f} ms")
+    print("batas atas IQR:", frames["bounds"].to_dict())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Pre-render semua varian grafik dashboard ke berkas (PNG, SVG, tabel JSON).
+
+Tanpa filter tanggal dashboard hanya punya 27 varian grafik (5 musim x 4
+grafik halaman 1, 3 jenis pengguna x 2 grafik halaman 2, 1 pie chart). Modul
+ini merender semuanya di muka dengan fungsi ``create_*`` yang sama (lewat
+chart_jobs.py) di pool proses, lalu menulis manifest::
+
+    prerendered/manifest.json
+    {"data_hash": <versi data>, "render_version": <versi renderer>,
+     "variants": {<variant_id>: {"hash", "png", "svg", "table"}}}
+
+``hash`` adalah hash tabel agregat masukan grafik dan versi renderer
+(``RENDER_VERSION``: isi charts.py, chart_jobs.py, figure_cache.py serta versi
+matplotlib/seaborn). Saat data berubah hanya varian yang tabelnya berubah yang
+dirender ulang; saat kode grafik berubah semua varian dirender ulang. Dashboard
+memakai PNG dari sini bila ``data_hash`` dan ``render_version`` sama dengan
+versi saat ini, sehingga tidak ada render per permintaan::
+
+    python dashboard/prerender.py [--workers 4] [--force]
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+
+from chart_jobs import all_charts, variant_id
+from data_loader import DATA_DIR, LOCAL_PATH, data_version
+from figure_cache import rasterize
+from metrics import cache_event
+
+
+# DASHBOARD_PRERENDER_DIR: folder lain (mis. folder kosong agar setiap grafik dirender, lihat benchmarks/load_test.py)
+PRERENDER_DIR = os.environ.get("DASHBOARD_PRERENDER_DIR", os.path.join(DATA_DIR, "prerendered"))
+MANIFEST = "manifest.json"
+# Berkas dan paket yang menentukan isi gambar; perubahan salah satunya membatalkan semua pre-render
+RENDER_SOURCES = ["charts.py", "chart_jobs.py", "figure_cache.py"]
+RENDER_PACKAGES = ["matplotlib", "seaborn"]
+
+_manifest_cache = {}
+_manifest_lock = threading.Lock()
+
+
+def _render_version():
+    digest = hashlib.sha1()
+    for name in RENDER_SOURCES:
+        with open(os.path.join(DATA_DIR, name), "rb") as f:
+            digest.update(f.read())
+    for package in RENDER_PACKAGES:
+        digest.update(f"{package}=={metadata.version(package)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+RENDER_VERSION = _render_version()
+
+
+def manifest_path(out_dir=PRERENDER_DIR):
+    return os.path.join(out_dir, MANIFEST)
+
+
+def read_manifest(out_dir=PRERENDER_DIR):
+    """Isi manifest, atau manifest kosong bila belum ada / rusak."""
+    try:
+        with open(manifest_path(out_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"data_hash": None, "render_version": None, "variants": {}}
+
+
+def write_manifest(manifest, out_dir=PRERENDER_DIR):
+    # Tulis ke berkas sementara lalu ganti, agar dashboard tidak membaca manifest setengah jadi
+    tmp = manifest_path(out_dir) + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, manifest_path(out_dir))
+
+
+def _cached_manifest(out_dir):
+    """Manifest dengan cache per mtime (dibaca ulang hanya bila berkas berubah)."""
+    path = manifest_path(out_dir)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    with _manifest_lock:
+        cached = _manifest_cache.get(out_dir)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, read_manifest(out_dir))
+            _manifest_cache[out_dir] = cached
+        return cached[1]
+
+
+def prerendered_image(key, version, out_dir=PRERENDER_DIR):
+    """PNG pre-render untuk kunci grafik pada versi data ``version`` dan renderer saat ini, atau None."""
+    manifest = _cached_manifest(out_dir)
+    entry = None
+    if manifest is not None and manifest.get("data_hash") == version and manifest.get("render_version") == RENDER_VERSION:
+        entry = manifest["variants"].get(variant_id(key))
+    image = None
+    if entry is not None:
+        try:
+            with open(os.path.join(out_dir, entry["png"]), "rb") as f:
+                image = f.read()
+        except OSError:
+            pass
+    cache_event("prerendered", image is not None)
+    return image
+
+
+def table_json(key, table):
+    """Tabel agregat sebagai JSON dan hash-nya (ikut kunci grafik dan versi renderer)."""
+    text = table.to_json(orient="split", date_format="iso")
+    digest = hashlib.sha1(RENDER_VERSION.encode("utf-8"))
+    digest.update(repr(key).encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return text, digest.hexdigest()
+
+
+def render_variant(name, out_dir, path=LOCAL_PATH):
+    """Merender satu varian ke ``<name>.svg`` dan ``<name>.png`` (dijalankan di proses pool)."""
+    import io
+
+    key, data, build = all_charts(path)[name]
+    fig = build(data())
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="svg", bbox_inches="tight")
+    with open(os.path.join(out_dir, name + ".svg"), "wb") as f:
+        f.write(buffer.getvalue())
+    # PNG sama persis dengan yang dibuat dashboard (rasterize juga menutup figure)
+    with open(os.path.join(out_dir, name + ".png"), "wb") as f:
+        f.write(rasterize(fig))
+    return name
+
+
+def prerender(out_dir=PRERENDER_DIR, workers=None, force=False, path=LOCAL_PATH):
+    """Merender varian yang tabelnya berubah; mengembalikan (dirender, dilewati)."""
+    os.makedirs(out_dir, exist_ok=True)
+    version = data_version(path)
+    old = read_manifest(out_dir)["variants"]
+    variants = {}
+    pending = []
+    for name, (key, data, build) in all_charts(path).items():
+        text, digest = table_json(key, data())
+        entry = {"key": list(key), "hash": digest, "png": name + ".png", "svg": name + ".svg", "table": name + ".json"}
+        variants[name] = entry
+        unchanged = old.get(name, {}).get("hash") == digest and all(
+            os.path.exists(os.path.join(out_dir, entry[fmt])) for fmt in ("png", "svg", "table"))
+        if unchanged and not force:
+            continue
+        with open(os.path.join(out_dir, entry["table"]), "w", encoding="utf-8") as f:
+            f.write(text)
+        pending.append(name)
+
+    if workers == 1 or len(pending) <= 1:
+        for name in pending:
+            render_variant(name, out_dir, path)
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(render_variant, pending, [out_dir] * len(pending), [path] * len(pending)))
+
+    write_manifest({"data_hash": version, "render_version": RENDER_VERSION, "variants": variants}, out_dir)
+    return pending, sorted(set(variants) - set(pending))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=PRERENDER_DIR, help="folder keluaran")
+    parser.add_argument("--workers", type=int, default=None, help="jumlah proses (default jumlah CPU)")
+    parser.add_argument("--force", action="store_true", help="render ulang semua varian")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rendered, skipped = prerender(args.out, args.workers, args.force)
+    print(f"{len(rendered)} varian dirender, {len(skipped)} tidak berubah ({time.perf_counter() - start:.1f} s) -> {manifest_path(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
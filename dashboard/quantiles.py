@@ -0,0 +1,260 @@
+"""Ringkasan kuantil per kelompok untuk box plot tanpa baris mentah.
+
+``sns.boxplot`` menerima semua baris dan mengurutkannya ulang setiap kali
+grafik dibuat. Di sini setiap kelompok disimpan sebagai ``QuantileSummary``:
+
+- data kecil (<= ``EXACT_LIMIT`` nilai): semua nilai terurut, sehingga
+  kuartil, whisker (1.5 x IQR) dan outlier sama persis dengan
+  ``matplotlib.cbook.boxplot_stats`` yang dipakai seaborn
+- data besar: sketsa kuantil KLL (kompaktor bertingkat, paling banyak ~3 x
+  ``KLL_K`` nilai berapa pun jumlah barisnya); galat rank kuartil < 0.5%
+  untuk k = 200, min/max/mean tetap eksak, outlier diambil dari nilai yang
+  tersimpan
+
+Ringkasan bisa digabung (``merge``/``combine``) dan ditambah (``add``). Cube
+kuantil menyimpan satu ringkasan per (musim, bulan); ringkasan satu musim
+atau rentang tanggal adalah gabungan sel-selnya, dan hanya bulan di tepi
+rentang tanggal yang dihitung dari baris hari. Ingest cukup menyusun ulang
+sel bulan yang berubah (lihat ingest.py).
+"""
+import numpy as np
+import pandas as pd
+
+from data_loader import LOCAL_PATH, cached_for_version
+from data_model import DAY_KEY, load_day_table
+from metrics import instrument
+from rollup import SEASON_NAMES, season_code
+
+
+EXACT_LIMIT = 2048
+KLL_K = 200
+WHIS = 1.5
+
+QUANTILE_COLUMNS = ["season", DAY_KEY, "total_rentals"]
+# Kolom tabel ringkasan box plot (satu baris per kelompok, urutan = urutan kotak)
+BOX_COLUMNS = ["label", "count", "mean", "q1", "med", "q3", "whislo", "whishi", "cilo", "cihi", "iqr", "fliers"]
+
+
+class QuantileSummary:
+    """Ringkasan kuantil yang bisa digabung: eksak untuk data kecil, sketsa KLL untuk data besar."""
+
+    def __init__(self, values=None, k=KLL_K, exact_limit=EXACT_LIMIT):
+        self.k = k
+        self.exact_limit = exact_limit
+        self.values = np.empty(0)  # mode eksak: semua nilai, terurut
+        self.levels = None         # mode sketsa: levels[h] berisi nilai berbobot 2**h
+        self._flip = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        if values is not None:
+            self.add(values)
+
+    @property
+    def exact(self):
+        return self.levels is None
+
+    def copy(self):
+        other = QuantileSummary(k=self.k, exact_limit=self.exact_limit)
+        other.values = self.values
+        other.levels = None if self.levels is None else list(self.levels)
+        other._flip, other.count, other.total, other.min, other.max = self._flip, self.count, self.total, self.min, self.max
+        return other
+
+    def add(self, values):
+        """Menambahkan nilai (in-place); beralih ke sketsa bila melewati ``exact_limit``."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if not len(values):
+            return self
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        if self.exact:
+            self.values = np.sort(np.concatenate([self.values, values]), kind="stable")
+            if len(self.values) > self.exact_limit:
+                self._to_sketch()
+        else:
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other):
+        """Ringkasan baru gabungan ``self`` dan ``other`` (keduanya tidak diubah)."""
+        merged = self.copy()
+        if not other.count:
+            return merged
+        merged.count += other.count
+        merged.total += other.total
+        merged.min = min(merged.min, other.min)
+        merged.max = max(merged.max, other.max)
+        if merged.exact and other.exact and len(merged.values) + len(other.values) <= merged.exact_limit:
+            merged.values = np.sort(np.concatenate([merged.values, other.values]), kind="stable")
+            return merged
+        if merged.exact:
+            merged._to_sketch(compress=False)
+        other_levels = [other.values] if other.exact else other.levels
+        for h, level in enumerate(other_levels):
+            if h == len(merged.levels):
+                merged.levels.append(np.empty(0))
+            merged.levels[h] = np.concatenate([merged.levels[h], level])
+        merged._compress()
+        return merged
+
+    # --- Sketsa KLL ---------------------------------------------------------
+
+    def _to_sketch(self, compress=True):
+        self.levels = [self.values]
+        self.values = np.empty(0)
+        if compress:
+            self._compress()
+
+    def _capacity(self, h):
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (len(self.levels) - 1 - h))))
+
+    def _compress(self):
+        # Selama total nilai melebihi total kapasitas: level terendah yang penuh
+        # diurutkan, separuh nilainya (ganjil/genap bergantian, deterministik)
+        # naik ke level berikutnya dengan bobot dua kali lipat
+        while sum(len(level) for level in self.levels) > sum(self._capacity(h) for h in range(len(self.levels))):
+            h = next(h for h in range(len(self.levels)) if len(self.levels[h]) > self._capacity(h))
+            level = np.sort(self.levels[h])
+            odd = len(level) % 2
+            promoted = level[self._flip:len(level) - odd:2]
+            self._flip ^= 1
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            self.levels[h] = level[len(level) - odd:]
+
+    def _weighted(self):
+        """(nilai terurut, bobot) yang mewakili semua nilai."""
+        if self.exact:
+            return self.values, np.ones(len(self.values))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    # --- Hasil --------------------------------------------------------------
+
+    def quantile(self, q):
+        """Kuantil ``q`` (skalar/array di [0, 1]); interpolasi linear seperti np.percentile pada mode eksak."""
+        q = np.asarray(q, dtype=np.float64)
+        if self.exact:
+            return np.percentile(self.values, q * 100)
+        items, weights = self._weighted()
+        # Titik tengah tiap bobot sebagai posisi rank, dipotong ke min/max eksak
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.clip(np.interp(q, positions, items), self.min, self.max)
+
+    def box_stats(self, label=None, whis=WHIS):
+        """Statistik box plot dalam format ``ax.bxp`` (sama dengan matplotlib.cbook.boxplot_stats)."""
+        q1, med, q3 = (float(v) for v in self.quantile([0.25, 0.5, 0.75]))
+        iqr = q3 - q1
+        low, high = q1 - whis * iqr, q3 + whis * iqr
+        items = self.values if self.exact else self._weighted()[0]
+        inside = items[(items >= low) & (items <= high)]
+        # Min/max selalu eksak; nilai di dalam pagar diambil dari nilai yang tersimpan
+        whishi = self.max if self.max <= high else (float(inside.max()) if len(inside) else q3)
+        whislo = self.min if self.min >= low else (float(inside.min()) if len(inside) else q1)
+        whishi, whislo = max(whishi, q3), min(whislo, q1)
+        fliers = items[(items < whislo) | (items > whishi)]
+        if not self.exact:
+            extremes = [v for v in (self.min, self.max) if v < whislo or v > whishi]
+            fliers = np.unique(np.concatenate([fliers, extremes]))
+        notch = 1.57 * iqr / np.sqrt(self.count)
+        return {"label": label, "count": self.count, "mean": self.total / self.count, "q1": q1, "med": med, "q3": q3,
+                "whislo": whislo, "whishi": whishi, "cilo": med - notch, "cihi": med + notch, "iqr": iqr,
+                "fliers": fliers.tolist()}
+
+
+def combine(summaries):
+    """Gabungan beberapa ringkasan (mis. semua bulan satu musim)."""
+    result = QuantileSummary()
+    for summary in summaries:
+        result = result.merge(summary)
+    return result
+
+
+def summarize_groups(df, keys, value):
+    """``{kunci kelompok: QuantileSummary}`` untuk kolom ``value`` per kombinasi ``keys``."""
+    return {key: QuantileSummary(group.to_numpy()) for key, group in df.groupby(keys, observed=True, sort=True)[value]}
+
+
+def _month(dates):
+    # Awal bulan (Timestamp) untuk setiap tanggal
+    return pd.Series(dates).dt.to_period("M").dt.to_timestamp()
+
+
+def month_cells(day_df):
+    """Cube kuantil total_rentals per (kode musim, awal bulan)."""
+    df = pd.DataFrame({"season": day_df["season"].to_numpy(), "month": _month(day_df[DAY_KEY]).to_numpy(),
+                       "total_rentals": day_df["total_rentals"].to_numpy()})
+    return summarize_groups(df, ["season", "month"], "total_rentals")
+
+
+def load_month_quantiles(path=LOCAL_PATH):
+    """Cube kuantil (musim, bulan) untuk versi data saat ini, dengan cache."""
+    return cached_for_version("day_quantiles", lambda: month_cells(load_day_table(QUANTILE_COLUMNS, path)), path)
+
+
+def load_season_quantiles(path=LOCAL_PATH):
+    """Ringkasan per kode musim untuk seluruh rentang tanggal, dengan cache."""
+    def build():
+        cells = load_month_quantiles(path)
+        return {season: combine(summary for (s, _), summary in sorted(cells.items()) if s == season)
+                for season in sorted({s for s, _ in cells})}
+    return cached_for_version("season_quantiles", build, path)
+
+
+def update_month_cells(cells, day_df, dates):
+    """Cube baru dengan sel bulan yang memuat ``dates`` disusun ulang dari ``day_df`` (tabel hari terbaru)."""
+    months = set(_month(pd.to_datetime(pd.Series(dates))))
+    cells = {key: summary for key, summary in cells.items() if key[1] not in months}
+    cells.update(month_cells(day_df[_month(day_df[DAY_KEY]).isin(months).to_numpy()]))
+    return dict(sorted(cells.items()))
+
+
+def _seasons(selected_season):
+    return list(SEASON_NAMES) if selected_season == "All Season" else [season_code(selected_season)]
+
+
+@instrument("filter.season_quantiles")
+def season_summaries(season_quantiles, selected_season):
+    """``{nama musim: QuantileSummary}`` untuk pilihan musim tanpa filter tanggal."""
+    return {SEASON_NAMES[s]: season_quantiles[s] for s in _seasons(selected_season) if s in season_quantiles}
+
+
+@instrument("filter.range_quantiles")
+def range_summaries(cells, selected_season, start, end, rows):
+    """Ringkasan per musim untuk rentang tanggal [start, end].
+
+    Bulan yang seluruhnya di dalam rentang diambil dari ``cells``; bulan di tepi
+    rentang dihitung dari ``rows(nama musim, awal, akhir)`` -> nilai total_rentals.
+    """
+    first, last = pd.Timestamp(start), pd.Timestamp(end)
+    result = {}
+    for season in _seasons(selected_season):
+        parts = []
+        for (s, month_first), summary in sorted(cells.items()):
+            if s != season:
+                continue
+            month_last = month_first + pd.offsets.MonthEnd(0)
+            if month_last < first or month_first > last:
+                continue
+            if first <= month_first and month_last <= last:
+                parts.append(summary)
+            else:
+                values = rows(SEASON_NAMES[season], max(first, month_first), min(last, month_last))
+                parts.append(QuantileSummary(values))
+        summary = combine(parts)
+        if summary.count:
+            result[SEASON_NAMES[season]] = summary
+    return result
+
+
+def box_stats_frame(summaries):
+    """Tabel statistik box plot (kolom ``BOX_COLUMNS``) dari ``{label: QuantileSummary}``."""
+    return pd.DataFrame([summary.box_stats(label) for label, summary in summaries.items()], columns=BOX_COLUMNS)
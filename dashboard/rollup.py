@@ -0,0 +1,148 @@
+"""Rollup cube pra-agregasi untuk semua grafik dashboard.
+
+Setiap grafik dulunya menghitung agregatnya dari baris mentah pada setiap
+rerun. Di sini agregat dihitung sekali per versi data (hash all_data.csv)
+pada dimensi musim x hari x (jam) x tahun x hari kerja x cuaca, masing-masing
+dengan sum/count/min/max. Grafik dan kartu total musim cukup mengiris cube,
+sehingga waktu render tidak lagi bergantung pada jumlah baris.
+
+Karena ``total_rentals`` adalah angka harian, cube terdiri dari dua tabel:
+
+- cube hari : season x weekday x yr x workingday x weathersit -> total_rentals
+- cube jam  : HOUR_season x HOUR_weekday x HOUR_hr x HOUR_yr x
+              HOUR_workingday x HOUR_weathersit -> HOUR_casual_replaced_upper,
+              HOUR_registered
+"""
+import numpy as np
+import pandas as pd
+
+from data_loader import LOCAL_PATH, cached_for_version
+from data_model import load_day_table, load_hour_table
+from group_kernel import AGGREGATES, aggregate, sum_by
+from metrics import instrument
+from schema import SEASON_ORDER
+
+
+DAY_DIMENSIONS = ["season", "weekday", "yr", "workingday", "weathersit"]
+DAY_MEASURES = ["total_rentals"]
+HOUR_DIMENSIONS = ["HOUR_season", "HOUR_weekday", "HOUR_hr", "HOUR_yr", "HOUR_workingday", "HOUR_weathersit"]
+HOUR_MEASURES = ["HOUR_casual_replaced_upper", "HOUR_registered"]
+
+# Kode musim / hari pada data asli (weekday 0 = Minggu)
+SEASON_NAMES = dict(enumerate(SEASON_ORDER, start=1))
+DAY_NAMES = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+
+
+@instrument("aggregate.build_cube")
+def build_cube(df, dimensions, measures):
+    """Sum/count/min/max setiap measure per kombinasi dimensi (satu baris per sel)."""
+    # Kernel bincount (lihat group_kernel.py); pandas hanya bila masukan tidak didukung
+    cube = aggregate(df, dimensions, measures)
+    if cube is not None:
+        return cube
+    # Measure disimpan ringkas (int16/int32); jumlahkan dalam int64 agar tidak overflow
+    df = df.astype({measure: "int64" for measure in measures})
+    cube = df.groupby(dimensions, observed=True, sort=True)[measures].agg(AGGREGATES)
+    cube.columns = [f"{measure}_{agg}" for measure, agg in cube.columns]
+    return cube.reset_index()
+
+
+def update_cube(cube, dimensions, measures, added, removed=None, rows=None):
+    """Menggabungkan delta ke cube tanpa membangun ulang dari semua baris.
+
+    ``added`` adalah baris baru; ``removed`` nilai lama dari baris yang
+    diperbarui (dikurangkan dari sum/count). Sel yang min/max-nya berasal dari
+    baris yang dihapus dihitung ulang dari ``rows()`` (tabel lengkap terbaru).
+    """
+    base = cube.set_index(dimensions)
+    delta = build_cube(added, dimensions, measures).set_index(dimensions)
+    cells = base.index.union(delta.index)
+    base = base.reindex(cells)
+    delta = delta.reindex(cells)
+    stale = pd.Series(False, index=cells)
+    if removed is not None and len(removed):
+        gone = build_cube(removed, dimensions, measures).set_index(dimensions).reindex(cells)
+        for measure in measures:
+            base[f"{measure}_sum"] -= gone[f"{measure}_sum"].fillna(0)
+            base[f"{measure}_count"] -= gone[f"{measure}_count"].fillna(0)
+            stale |= (gone[f"{measure}_min"] <= base[f"{measure}_min"]) | (gone[f"{measure}_max"] >= base[f"{measure}_max"])
+    for measure in measures:
+        for agg in ("sum", "count"):
+            base[f"{measure}_{agg}"] = base[f"{measure}_{agg}"].fillna(0) + delta[f"{measure}_{agg}"].fillna(0)
+        base[f"{measure}_min"] = np.fmin(base[f"{measure}_min"], delta[f"{measure}_min"])
+        base[f"{measure}_max"] = np.fmax(base[f"{measure}_max"], delta[f"{measure}_max"])
+    if stale.any():
+        stale_cells = stale.index[stale]
+        rows = rows()
+        keys = pd.MultiIndex.from_frame(rows[dimensions]) if len(dimensions) > 1 else pd.Index(rows[dimensions[0]])
+        fresh = build_cube(rows[keys.isin(stale_cells)], dimensions, measures).set_index(dimensions)
+        base.loc[stale_cells] = fresh.reindex(stale_cells)
+    base = base[base[f"{measures[0]}_count"] > 0]
+    return base.astype("int64").sort_index().reset_index()
+
+
+def load_day_cube(path=LOCAL_PATH):
+    """Cube hari untuk versi data saat ini, dengan cache."""
+    return cached_for_version("day_cube", lambda: build_cube(load_day_table(DAY_DIMENSIONS + DAY_MEASURES, path), DAY_DIMENSIONS, DAY_MEASURES), path)
+
+
+def load_hour_cube(path=LOCAL_PATH):
+    """Cube jam untuk versi data saat ini, dengan cache."""
+    return cached_for_version("hour_cube", lambda: build_cube(load_hour_table(HOUR_DIMENSIONS + HOUR_MEASURES, path), HOUR_DIMENSIONS, HOUR_MEASURES), path)
+
+
+def load_cubes(path=LOCAL_PATH):
+    """Mengembalikan (cube hari, cube jam) untuk versi data saat ini."""
+    return load_day_cube(path), load_hour_cube(path)
+
+
+def season_code(season_name):
+    return SEASON_ORDER.index(season_name) + 1
+
+
+@instrument("filter.slice_season")
+def slice_season(cube, selected_season, column="season"):
+    """Mengiris cube untuk satu musim; "All Season" mengembalikan cube utuh."""
+    if selected_season == "All Season":
+        return cube
+    return cube[cube[column] == season_code(selected_season)]
+
+
+def _by_season(cube, measure):
+    grouped = sum_by(cube, ["season"], [f"{measure}_sum", f"{measure}_count"])
+    grouped.index = pd.CategoricalIndex(grouped.index.map(SEASON_NAMES), categories=SEASON_ORDER, name="season_new")
+    return grouped
+
+
+def season_totals(cube, measure="total_rentals"):
+    """Total per musim (pengganti sns.barplot estimator='sum')."""
+    return _by_season(cube, measure)[f"{measure}_sum"].rename(measure)
+
+
+def season_means(cube, measure="total_rentals"):
+    """Rata-rata per musim (pengganti groupby('season_new').mean())."""
+    grouped = _by_season(cube, measure)
+    return (grouped[f"{measure}_sum"] / grouped[f"{measure}_count"]).rename(measure)
+
+
+def season_weekday_means(cube, measure="total_rentals"):
+    """Matriks rata-rata musim x nama hari (pengganti pivot_table heatmap)."""
+    grouped = sum_by(cube, ["season", "weekday"], [f"{measure}_sum", f"{measure}_count"])
+    means = (grouped[f"{measure}_sum"] / grouped[f"{measure}_count"]).unstack("weekday")
+    means.index = pd.CategoricalIndex(means.index.map(SEASON_NAMES), categories=SEASON_ORDER, name="season_new")
+    means.columns = pd.Index(means.columns.map(lambda code: DAY_NAMES[code]), name="DAY_dteday")
+    # Urutan kolom sama dengan pivot_table (alfabetis)
+    return means.sort_index(axis=1)
+
+
+def hourly_means(cube, measures=HOUR_MEASURES):
+    """Rata-rata per jam untuk tiap measure (24 baris, indeks HOUR_hr)."""
+    sums = [f"{measure}_sum" for measure in measures]
+    counts = [f"{measure}_count" for measure in measures]
+    grouped = sum_by(cube, ["HOUR_hr"], sums + counts)
+    return pd.DataFrame({measure: grouped[f"{measure}_sum"] / grouped[f"{measure}_count"] for measure in measures})
+
+
+def measure_totals(cube, measures=HOUR_MEASURES):
+    """Total keseluruhan tiap measure (untuk pie chart proporsi)."""
+    return pd.Series({measure: cube[f"{measure}_sum"].sum() for measure in measures})
@@ -0,0 +1,131 @@
+"""Skema tipe data ringkas untuk setiap kolom all_data.
+
+Semua kolom all_data.csv terbaca sebagai int64/float64/object. Modul ini
+mendeklarasikan tipe tersempit yang aman untuk setiap kolom (int kecil,
+float32 untuk cuaca ternormalisasi 0-1, Categorical untuk ``season_new``),
+memvalidasi rentang nilai saat data dimuat (rentang bisnis dan rentang tipe
+tujuan, agar ``astype`` tidak pernah membungkus nilai diam-diam), lalu
+melakukan downcast.
+
+Laporan penghematan memori per kolom:
+
+    python dashboard/schema.py
+"""
+import numpy as np
+import pandas as pd
+
+from metrics import instrument
+
+
+# Naikkan setiap kali skema berubah agar snapshot lama dibuat ulang
+SCHEMA_VERSION = "2"
+
+SEASON_ORDER = ["Spring", "Summer", "Fall", "Winter"]
+SEASON_DTYPE = pd.CategoricalDtype(SEASON_ORDER)
+
+# kolom (nama asli di CSV tanpa prefix) -> (tipe, nilai minimum, nilai maksimum)
+# None berarti tidak ada batas bisnis pada sisi tersebut (batas tipe tetap diperiksa)
+COLUMN_SPECS = {
+    "instant": ("int32", 1, None),
+    "season": ("int8", 1, 4),
+    # int16: data multi-tahun (mis. bench_scale.py --multiples 100) melewati 127
+    "yr": ("int16", 0, None),
+    "mnth": ("int8", 1, 12),
+    "hr": ("int8", 0, 23),
+    "holiday": ("int8", 0, 1),
+    "weekday": ("int8", 0, 6),
+    "workingday": ("int8", 0, 1),
+    "weathersit": ("int8", 1, 4),
+    "temp": ("float32", 0, 1),
+    "atemp": ("float32", 0, 1),
+    "hum": ("float32", 0, 1),
+    "windspeed": ("float32", 0, 1),
+    "windspeed_replaced_upper": ("float32", 0, 1),
+    "casual": ("int32", 0, None),
+    "registered": ("int32", 0, None),
+    "total_rentals": ("int32", 0, None),
+    "cnt": ("int32", 0, None),
+    "casual_replaced_upper": ("int32", 0, None),
+    "season_new": (SEASON_DTYPE, None, None),
+}
+
+# Kolom per jam selalu di bawah 32767 sehingga cukup int16 (validate menolak nilai di atasnya)
+HOUR_INT16 = {"casual", "registered", "cnt", "casual_replaced_upper"}
+
+
+def column_spec(col):
+    """Mengembalikan (tipe, min, max) untuk nama kolom dengan/tanpa prefix DAY_/HOUR_."""
+    base = col
+    for prefix in ("DAY_", "HOUR_"):
+        if col.startswith(prefix):
+            base = col[len(prefix):]
+    spec = COLUMN_SPECS.get(base)
+    if spec is not None and col.startswith("HOUR_") and base in HOUR_INT16:
+        spec = ("int16",) + spec[1:]
+    return spec
+
+
+def value_range(spec):
+    """(min, max) yang diizinkan: batas bisnis dipersempit ke rentang tipe bilangan bulat tujuan."""
+    dtype, lower, upper = spec
+    if not pd.api.types.is_integer_dtype(dtype):
+        return lower, upper
+    info = np.iinfo(dtype)
+    lower = info.min if lower is None else max(info.min, lower)
+    upper = info.max if upper is None else min(info.max, upper)
+    return lower, upper
+
+
+def validate(df):
+    """Memeriksa rentang nilai setiap kolom yang punya skema; ValueError bila melanggar."""
+    for col in df.columns:
+        spec = column_spec(col)
+        if spec is None:
+            continue
+        dtype = spec[0]
+        values = df[col]
+        if isinstance(dtype, pd.CategoricalDtype):
+            invalid = ~values.isin(dtype.categories) & values.notna()
+            if invalid.any():
+                raise ValueError(f"Kolom {col} berisi nilai di luar {list(dtype.categories)}: {values[invalid].unique()[:5].tolist()}")
+            continue
+        if values.isna().any():
+            raise ValueError(f"Kolom {col} berisi nilai kosong.")
+        lower, upper = value_range(spec)
+        if lower is not None and values.min() < lower:
+            raise ValueError(f"Kolom {col} berisi nilai di bawah {lower}: {values.min()}")
+        if upper is not None and values.max() > upper:
+            raise ValueError(f"Kolom {col} berisi nilai di atas {upper}: {values.max()}")
+
+
+@instrument("convert.apply_schema")
+def apply_schema(df):
+    """Memvalidasi lalu men-downcast setiap kolom ke tipe di skema."""
+    validate(df)
+    dtypes = {col: spec[0] for col in df.columns if (spec := column_spec(col)) is not None}
+    return df.astype(dtypes)
+
+
+def memory_report(before, after):
+    """Tabel penghematan memori per kolom (byte) antara dua DataFrame."""
+    report = pd.DataFrame({
+        "tipe_awal": before.dtypes.astype(str),
+        "tipe_baru": after.dtypes.astype(str),
+        "byte_awal": before.memory_usage(index=False, deep=True),
+        "byte_baru": after.memory_usage(index=False, deep=True),
+    })
+    report["hemat"] = report["byte_awal"] - report["byte_baru"]
+    report.loc["TOTAL"] = ["", "", report["byte_awal"].sum(), report["byte_baru"].sum(), report["hemat"].sum()]
+    return report
+
+
+def main():
+    from data_loader import LOCAL_PATH, read_all_data
+
+    before = read_all_data(LOCAL_PATH, typed=False)
+    after = apply_schema(before)
+    print(memory_report(before, after).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Indeks seleksi zero-copy untuk filter musim, jenis pengguna, dan rentang tanggal.
+
+Dibangun sekali per versi data. Baris diurutkan ulang agar setiap pilihan
+filter menjadi potongan (slice) yang bersebelahan:
+
+- tabel hari : urut (season, DAY_dteday); setiap musim satu slice, dan di
+  dalamnya rentang tanggal dicari dengan binary search.
+- tabel jam  : urut (HOUR_season, HOUR_hr, dteday); setiap pasangan
+  musim x jam satu slice (tabel offset 4 x 24).
+
+Filter mengembalikan view (``iloc`` dengan slice) alih-alih salinan. Total dan
+jumlah baris untuk rentang tanggal dijawab dari prefix sum, sehingga biayanya
+O(log n) per slice berapa pun panjang riwayat datanya. Hasil ``day_rollup`` dan
+``hour_rollup`` berbentuk sama dengan rollup cube (kolom ``*_sum``/``*_count``)
+sehingga fungsi irisan di ``rollup.py`` bisa langsung dipakai.
+
+Saat ingest (``extend``), baris baru disisipkan ke slice selnya masing-masing:
+hanya ekor setiap sel yang terkena yang diurutkan ulang, offset digeser, dan
+prefix sum dihitung ulang mulai dari posisi pertama yang berubah.
+"""
+import numpy as np
+import pandas as pd
+
+from data_loader import LOCAL_PATH, cached_for_version
+from data_model import load_day_table, load_hour_table
+from metrics import instrument
+from rollup import HOUR_MEASURES, SEASON_NAMES, season_code
+
+
+SEASONS = list(SEASON_NAMES)
+HOURS = 24
+
+DAY_INDEX_COLUMNS = ["season", "weekday", "DAY_dteday", "total_rentals", "season_new"]
+HOUR_INDEX_COLUMNS = ["HOUR_season", "HOUR_hr", "dteday"] + HOUR_MEASURES
+
+
+def _prefix_sum(values):
+    return np.concatenate([[0], np.cumsum(values, dtype=np.int64)])
+
+
+def _extend_prefix_sum(cumsum, values, first):
+    # Prefix sum sampai posisi ``first`` tetap; sisanya dihitung dari nilai baru
+    return np.concatenate([cumsum[:first + 1], cumsum[first] + np.cumsum(values[first:], dtype=np.int64)])
+
+
+def splice_sorted(frame, dates, offsets, added, cells, date_column):
+    """Menyisipkan ``added`` ke ``frame`` yang terurut (sel, tanggal).
+
+    ``offsets[c] .. offsets[c + 1]`` adalah baris sel ``c`` di ``frame`` dan
+    ``cells`` sel setiap baris ``added``. Baris ``added`` yang (sel, tanggal)-nya
+    sudah ada menggantikan baris lama. Hanya ekor sel yang terkena (mulai dari
+    tanggal baru terkecil) yang diurutkan ulang. Mengembalikan (frame baru,
+    offsets baru, posisi pertama yang berubah).
+    """
+    n = len(frame)
+    combined = pd.concat([frame, added], ignore_index=True)
+    combined_dates = combined[date_column].to_numpy()
+    counts = np.zeros(len(offsets) - 1, dtype=np.int64)
+    # Urutan baris hasil sebagai posisi di ``combined`` (baris added mulai di posisi n)
+    order = []
+    previous, first = 0, n
+    for cell in np.unique(cells):
+        lo, hi = int(offsets[cell]), int(offsets[cell + 1])
+        new = n + np.flatnonzero(cells == cell)
+        start = lo + int(np.searchsorted(dates[lo:hi], combined_dates[new].min()))
+        # Baris lama dengan tanggal yang sama diganti baris baru
+        old = start + np.flatnonzero(~np.isin(dates[start:hi], combined_dates[new]))
+        tail = np.concatenate([old, new])
+        tail = tail[np.argsort(combined_dates[tail], kind="stable")]
+        counts[cell] = len(tail) - (hi - start)
+        order += [np.arange(previous, start), tail]
+        previous = hi
+        first = min(first, start)
+    order.append(np.arange(previous, n))
+    new_offsets = np.asarray(offsets) + np.concatenate([[0], np.cumsum(counts)])
+    return combined.take(np.concatenate(order)).reset_index(drop=True), new_offsets, first
+
+
+def _date_bounds(first, last, dates):
+    # Tanggal pertama/terakhir setelah ``dates`` ditambahkan
+    if not len(dates):
+        return first, last
+    low, high = dates.min(), dates.max()
+    return (low if first is None else min(first, low)), (high if last is None else max(last, high))
+
+
+def _to_datetime64(value, default):
+    if value is None:
+        return default
+    return np.datetime64(pd.Timestamp(value), "ns")
+
+
+def _date_span(dates, start, stop, first, last):
+    """Batas [a, b) baris dalam slice [start, stop) yang tanggalnya di [first, last]."""
+    window = dates[start:stop]
+    return (start + int(np.searchsorted(window, first, side="left")),
+            start + int(np.searchsorted(window, last, side="right")))
+
+
+class DayIndex:
+    """Tabel hari terurut (season, tanggal) dengan offset per musim dan prefix sum."""
+
+    def __init__(self, day_df):
+        day = day_df.sort_values(["season", "DAY_dteday"], kind="stable").reset_index(drop=True)
+        # offsets[s - 1] .. offsets[s] adalah baris musim s
+        offsets = np.searchsorted(day["season"].to_numpy(), np.arange(1, len(SEASONS) + 2))
+        self._set(day, offsets, _prefix_sum(day["total_rentals"].to_numpy()), *_date_bounds(None, None, day["DAY_dteday"].to_numpy()))
+
+    def _set(self, day, offsets, cumsum, first_date, last_date):
+        self.day = day
+        self.dates = day["DAY_dteday"].to_numpy()
+        self.offsets = offsets
+        self.cumsum = cumsum
+        self.first_date = first_date
+        self.last_date = last_date
+
+    def extend(self, days):
+        """Indeks baru dengan ``days`` (hari baru atau pengganti tanggal yang sudah ada) disisipkan."""
+        cells = days["season"].to_numpy(np.int64) - 1
+        day, offsets, first = splice_sorted(self.day, self.dates, self.offsets, days[self.day.columns], cells, "DAY_dteday")
+        index = DayIndex.__new__(DayIndex)
+        index._set(day, offsets, _extend_prefix_sum(self.cumsum, day["total_rentals"].to_numpy(), first),
+                   *_date_bounds(self.first_date, self.last_date, days["DAY_dteday"].to_numpy()))
+        return index
+
+    def date_bounds(self):
+        return pd.Timestamp(self.first_date).date(), pd.Timestamp(self.last_date).date()
+
+    def spans(self, selected_season, start=None, end=None):
+        """Daftar (musim, a, b): baris [a, b) milik musim tsb. di rentang tanggal."""
+        seasons = SEASONS if selected_season == "All Season" else [season_code(selected_season)]
+        first = _to_datetime64(start, self.first_date)
+        last = _to_datetime64(end, self.last_date)
+        return [(season, *_date_span(self.dates, self.offsets[season - 1], self.offsets[season], first, last))
+                for season in seasons]
+
+    @instrument("filter.filter_days")
+    def filter_days(self, selected_season, start=None, end=None):
+        """Baris hari untuk pilihan filter; view bila hasilnya satu slice bersebelahan."""
+        spans = [(a, b) for _, a, b in self.spans(selected_season, start, end) if b > a]
+        if not spans:
+            return self.day.iloc[0:0]
+        if all(spans[i][1] == spans[i + 1][0] for i in range(len(spans) - 1)):
+            return self.day.iloc[spans[0][0]:spans[-1][1]]
+        return pd.concat([self.day.iloc[a:b] for a, b in spans])
+
+    @instrument("filter.day_rollup")
+    def day_rollup(self, selected_season, start=None, end=None):
+        """Total dan jumlah hari per musim dari prefix sum (bentuk sama dengan cube hari)."""
+        rows = [(season, self.cumsum[b] - self.cumsum[a], b - a)
+                for season, a, b in self.spans(selected_season, start, end) if b > a]
+        return pd.DataFrame(rows, columns=["season", "total_rentals_sum", "total_rentals_count"])
+
+
+class HourIndex:
+    """Tabel jam terurut (musim, jam, tanggal) dengan tabel offset musim x jam."""
+
+    def __init__(self, hour_df, measures=HOUR_MEASURES):
+        hour = hour_df.sort_values(["HOUR_season", "HOUR_hr", "dteday"], kind="stable").reset_index(drop=True)
+        # offsets[k] .. offsets[k + 1] adalah baris sel k = (musim - 1) * 24 + jam
+        offsets = np.searchsorted(self._cells(hour), np.arange(len(SEASONS) * HOURS + 1))
+        cumsums = {measure: _prefix_sum(hour[measure].to_numpy()) for measure in measures}
+        self._set(hour, offsets, cumsums, *_date_bounds(None, None, hour["dteday"].to_numpy()))
+
+    @staticmethod
+    def _cells(hour_df):
+        return (hour_df["HOUR_season"].to_numpy(np.int64) - 1) * HOURS + hour_df["HOUR_hr"].to_numpy(np.int64)
+
+    def _set(self, hour, offsets, cumsums, first_date, last_date):
+        self.hour = hour
+        self.dates = hour["dteday"].to_numpy()
+        self.measures = list(cumsums)
+        self.offsets = offsets
+        self.cumsums = cumsums
+        self.first_date = first_date
+        self.last_date = last_date
+
+    def extend(self, hours):
+        """Indeks baru dengan baris jam ``hours`` disisipkan ke sel musim x jam-nya."""
+        hour, offsets, first = splice_sorted(self.hour, self.dates, self.offsets, hours[self.hour.columns], self._cells(hours), "dteday")
+        cumsums = {measure: _extend_prefix_sum(cumsum, hour[measure].to_numpy(), first) for measure, cumsum in self.cumsums.items()}
+        index = HourIndex.__new__(HourIndex)
+        index._set(hour, offsets, cumsums, *_date_bounds(self.first_date, self.last_date, hours["dteday"].to_numpy()))
+        return index
+
+    def date_bounds(self):
+        return pd.Timestamp(self.first_date).date(), pd.Timestamp(self.last_date).date()
+
+    def filter_hours(self, season, hour):
+        """View baris untuk satu musim (kode 1-4) dan satu jam."""
+        cell = (season - 1) * HOURS + hour
+        return self.hour.iloc[self.offsets[cell]:self.offsets[cell + 1]]
+
+    @instrument("filter.hour_rollup")
+    def hour_rollup(self, start=None, end=None):
+        """Total dan jumlah baris per musim x jam di rentang tanggal (bentuk sama dengan cube jam)."""
+        first = _to_datetime64(start, self.first_date)
+        last = _to_datetime64(end, self.last_date)
+        rows = []
+        for cell in range(len(SEASONS) * HOURS):
+            a, b = _date_span(self.dates, self.offsets[cell], self.offsets[cell + 1], first, last)
+            if b > a:
+                rows.append([cell // HOURS + 1, cell % HOURS] + [value for measure in self.measures
+                                                              for value in (self.cumsums[measure][b] - self.cumsums[measure][a], b - a)])
+        columns = ["HOUR_season", "HOUR_hr"] + [f"{measure}_{agg}" for measure in self.measures for agg in ("sum", "count")]
+        return pd.DataFrame(rows, columns=columns)
+
+
+def load_day_index(path=LOCAL_PATH):
+    return cached_for_version("day_index", lambda: DayIndex(load_day_table(DAY_INDEX_COLUMNS, path)), path)
+
+
+def load_hour_index(path=LOCAL_PATH):
+    return cached_for_version("hour_index", lambda: HourIndex(load_hour_table(HOUR_INDEX_COLUMNS, path)), path)
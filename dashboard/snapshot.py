@@ -0,0 +1,114 @@
+"""Snapshot kolumnar (Feather/Arrow IPC) untuk all_data.csv, day.csv, dan hour.csv.
+
+Selain all_data utuh, all_data.csv juga disimpan sebagai tabel hari dan tabel
+jam ternormalisasi (``day_table``/``hour_table``, lihat ``data_model.py``).
+
+Parsing teks CSV adalah biaya terbesar saat dashboard pertama kali dibuka.
+Modul ini mengonversi CSV ke file Feather tanpa kompresi sehingga dapat dibaca
+dengan memory-map dan hanya kolom yang dibutuhkan halaman aktif yang dimuat.
+Snapshot menyimpan hash isi CSV sumbernya (sama dengan ``data_version``) dan
+dibuat ulang otomatis bila hash tersebut atau versi skema berbeda.
+
+Jalankan sebagai build step (opsional, dashboard juga membuatnya sendiri):
+
+    python dashboard/snapshot.py
+"""
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+
+from data_loader import DATA_DIR, LOCAL_PATH, data_version, read_all_data
+from data_model import read_day_table, read_hour_table
+from metrics import instrument
+from schema import SCHEMA_VERSION, apply_schema
+
+
+REPO_DIR = os.path.dirname(DATA_DIR)
+
+
+def read_raw_csv(path, columns=None):
+    return apply_schema(pd.read_csv(path, usecols=columns, parse_dates=["dteday"], date_format="%Y-%m-%d"))
+
+
+# Sumber CSV dan fungsi pembacanya (hasil pembacaan = isi snapshot)
+SOURCES = {
+    "all_data": (LOCAL_PATH, read_all_data),
+    "day_table": (LOCAL_PATH, read_day_table),
+    "hour_table": (LOCAL_PATH, read_hour_table),
+    "day": (os.path.join(REPO_DIR, "data", "day.csv"), read_raw_csv),
+    "hour": (os.path.join(REPO_DIR, "data", "hour.csv"), read_raw_csv),
+}
+
+
+def snapshot_path(name, csv_path):
+    # Snapshot disimpan di folder snapshot/ di samping CSV sumbernya, diberi nama
+    # sesuai CSV agar beberapa CSV dalam satu folder tidak berbagi snapshot
+    source = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), "snapshot", f"{source}.{name}.feather")
+
+
+def _metadata(path):
+    with pa.memory_map(path) as source:
+        return ipc.open_file(source).schema.metadata or {}
+
+
+def is_stale(csv_path, path):
+    if not os.path.exists(path):
+        return True
+    # Snapshot dari isi CSV lain atau dari skema tipe data lama dianggap kedaluwarsa
+    metadata = _metadata(path)
+    return (metadata.get(b"source_version", b"").decode() != data_version(csv_path)
+            or metadata.get(b"schema_version", b"").decode() != SCHEMA_VERSION)
+
+
+def build_snapshot(name, csv_path=None):
+    """Membaca CSV sumber dan menulis snapshot Feather (ditulis atomik)."""
+    default_csv, reader = SOURCES[name]
+    csv_path = csv_path or default_csv
+    # Hash dihitung sebelum membaca: bila CSV berubah di tengah jalan, snapshot dibuat ulang pada pemanggilan berikutnya
+    source_version = data_version(csv_path)
+    df = reader(csv_path)
+
+    path = snapshot_path(name, csv_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # Tanpa kompresi agar bisa di-memory-map tanpa dekompresi
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"schema_version": SCHEMA_VERSION.encode(),
+                                           b"source_version": source_version.encode()})
+    feather.write_feather(table, tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    return path
+
+
+def ensure_snapshot(name, csv_path=None):
+    """Mengembalikan path snapshot, membuat ulang bila isi CSV sudah berbeda."""
+    csv_path = csv_path or SOURCES[name][0]
+    path = snapshot_path(name, csv_path)
+    if is_stale(csv_path, path):
+        build_snapshot(name, csv_path)
+    return path
+
+
+@instrument("load.snapshot")
+def read_snapshot(name, columns=None, csv_path=None):
+    """Membaca snapshot (memory-mapped), opsional hanya kolom tertentu."""
+    path = ensure_snapshot(name, csv_path)
+    table = feather.read_table(path, columns=list(columns) if columns else None, memory_map=True)
+    # split_blocks menghindari konsolidasi blok sehingga kolom numerik bisa zero-copy
+    return table.to_pandas(split_blocks=True)
+
+
+def main(argv=None):
+    names = (argv if argv is not None else sys.argv[1:]) or list(SOURCES)
+    for name in names:
+        path = build_snapshot(name)
+        print(f"{name}: {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Backend grafik sisi klien: spesifikasi Vega-Lite dari tabel agregat.
+
+Pasangan setiap ``create_*`` di charts.py dengan argumen yang sama, tetapi
+hasilnya berupa dict Vega-Lite (ditampilkan dengan ``st.vega_lite_chart``),
+bukan Figure. Server hanya mengirim tabel kecil yang sudah diagregasi (total
+dan rata-rata per musim, matriks musim x hari, statistik box plot, 24 baris
+rata-rata per jam); browser yang menggambar grafiknya. Tidak ada matplotlib,
+seaborn, rasterisasi PNG, maupun cache gambar di jalur ini.
+
+Judul, warna (``lightcoral``/``lightskyblue``, biru bawaan matplotlib) dan
+format sumbu ribuan/jutaan (``format_angka`` -> ekspresi ``FORMAT_ANGKA``)
+sama dengan versi matplotlib. Dipilih per deployment lewat
+``DASHBOARD_CHART_BACKEND=vega`` (lihat dashboard.py).
+"""
+import json
+
+import pandas as pd
+
+from metrics import instrument
+
+
+SCHEMA = "https://vega.github.io/schema/vega-lite/v5.json"
+HEIGHT = 400
+
+# Warna bawaan matplotlib (C0) dan gaya sns.boxplot (C0 desaturasi 0.75, garis abu-abu)
+DEFAULT_COLOR = "#1f77b4"
+BOX_COLOR = "#3274a1"
+BOX_LINE_COLOR = "#3f3f3f"
+USER_COLORS = {"Kasual": "lightcoral", "Terdaftar": "lightskyblue"}
+
+# Sama dengan charts.format_angka: ribuan -> K, jutaan -> J
+FORMAT_ANGKA = ("datum.value >= 1000000 ? format(datum.value * 1e-6, '.0f') + 'J' : "
+                "datum.value >= 1000 ? format(datum.value * 1e-3, '.0f') + 'K' : format(datum.value, '.0f')")
+
+
+def _records(df):
+    # Nilai numpy/kategori -> tipe JSON biasa
+    return json.loads(df.to_json(orient="records"))
+
+
+def _spec(title, data, **spec):
+    return {"$schema": SCHEMA, "title": title, "height": HEIGHT, "data": {"values": data}, **spec}
+
+
+def _user_label(column, user_type):
+    if user_type == "Semua Pengguna":
+        return "Kasual" if column == "HOUR_casual_replaced_upper" else "Terdaftar"
+    return user_type
+
+
+def _user_color(labels):
+    return {"field": "pengguna", "type": "nominal", "title": None,
+            "scale": {"domain": labels, "range": [USER_COLORS.get(label, DEFAULT_COLOR) for label in labels]}}
+
+
+### AREA LOAD DATA 1
+# 1. Bar Chart total per musim
+@instrument("chart.vega_bar_chart")
+def vega_bar_chart(df, x_col, y_col, title):
+    return _spec(title, _records(df[[x_col, y_col]].astype({x_col: str})), mark={"type": "bar", "color": DEFAULT_COLOR}, encoding={
+        "x": {"field": x_col, "type": "nominal", "sort": None, "title": x_col, "axis": {"labelAngle": 0}},
+        "y": {"field": y_col, "type": "quantitative", "title": "Total Jumlah " + y_col, "axis": {"labelExpr": FORMAT_ANGKA}},
+        "tooltip": [{"field": x_col}, {"field": y_col, "format": ","}],
+    })
+
+
+# 2. Box Plot dari tabel statistik (quantiles.box_stats_frame)
+@instrument("chart.vega_box_plot")
+def vega_box_plot(stats_df, x_col, y_col, title):
+    labels = stats_df["label"].astype(str).tolist()
+    boxes = _records(stats_df.drop(columns="fliers").assign(label=labels))
+    fliers = [{"label": label, "value": value} for label, values in zip(labels, stats_df["fliers"]) for value in values]
+    x = {"field": "label", "type": "nominal", "sort": labels, "title": x_col, "axis": {"labelAngle": 0}}
+    y_title = "Jumlah " + y_col
+    return _spec(title, boxes, encoding={"x": x}, layer=[
+        {"mark": {"type": "rule", "color": BOX_LINE_COLOR},
+         "encoding": {"y": {"field": "whislo", "type": "quantitative", "title": y_title}, "y2": {"field": "whishi"}}},
+        {"mark": {"type": "tick", "color": BOX_LINE_COLOR, "size": 20}, "encoding": {"y": {"field": "whislo", "type": "quantitative"}}},
+        {"mark": {"type": "tick", "color": BOX_LINE_COLOR, "size": 20}, "encoding": {"y": {"field": "whishi", "type": "quantitative"}}},
+        {"mark": {"type": "bar", "color": BOX_COLOR, "stroke": BOX_LINE_COLOR, "size": 40},
+         "encoding": {"y": {"field": "q1", "type": "quantitative"}, "y2": {"field": "q3"},
+                      "tooltip": [{"field": "label"}, {"field": "count"}, {"field": "q1"}, {"field": "med"}, {"field": "q3"},
+                                  {"field": "whislo"}, {"field": "whishi"}]}},
+        {"mark": {"type": "tick", "color": BOX_LINE_COLOR, "size": 40}, "encoding": {"y": {"field": "med", "type": "quantitative"}}},
+        {"data": {"values": fliers}, "mark": {"type": "point", "color": BOX_LINE_COLOR},
+         "encoding": {"y": {"field": "value", "type": "quantitative"}}},
+    ])
+
+
+# 3. Line Chart rata-rata per musim
+@instrument("chart.vega_line_chart")
+def vega_line_chart(df, x_col, y_col, title):
+    return _spec(title, _records(df[[x_col, y_col]].astype({x_col: str})),
+                 mark={"type": "line", "point": True, "color": DEFAULT_COLOR}, encoding={
+        "x": {"field": x_col, "type": "nominal", "sort": None, "title": x_col, "axis": {"labelAngle": 0}},
+        "y": {"field": y_col, "type": "quantitative", "title": "Rata-rata " + y_col},
+        "tooltip": [{"field": x_col}, {"field": y_col, "format": ",.0f"}],
+    })
+
+
+# 4. Heatmap rata-rata musim x hari
+@instrument("chart.vega_heatmap")
+def vega_heatmap(pivot_table):
+    seasons = [str(season) for season in pivot_table.index]
+    days = [str(day) for day in pivot_table.columns]
+    cells = pd.DataFrame({"season": [str(season) for season in pivot_table.index.repeat(len(days))],
+                          "day": days * len(seasons), "value": pivot_table.to_numpy().ravel()})
+    # Angka di sel gelap ditulis putih, seperti anotasi sns.heatmap
+    middle = float(cells["value"].agg(["min", "max"]).mean()) if cells["value"].notna().any() else 0.0
+    x = {"field": "day", "type": "nominal", "sort": days, "title": "Hari dalam Seminggu"}
+    y = {"field": "season", "type": "nominal", "sort": seasons, "title": "Musim"}
+    return _spec("Heatmap Rata-rata Penyewaan per Musim dan Hari dalam Seminggu", _records(cells), encoding={"x": x, "y": y}, layer=[
+        {"mark": "rect", "encoding": {"color": {"field": "value", "type": "quantitative", "title": None,
+                                                "scale": {"scheme": "yellowgreenblue"}}}},
+        {"mark": {"type": "text"}, "encoding": {"text": {"field": "value", "type": "quantitative", "format": ".0f"},
+                                                 "color": {"condition": {"test": f"datum.value > {middle}", "value": "white"},
+                                                           "value": "black"}}},
+    ])
+
+
+## AREA LOAD DATA 2
+# Rata-rata per jam (24 baris, kolom HOUR_hr) -> tabel panjang (jam, pengguna, nilai)
+def _hourly_long(df, x_col, y_cols, user_type):
+    hourly_avg = df.set_index(x_col)[y_cols]
+    return pd.DataFrame({
+        "HOUR_hr": list(hourly_avg.index) * len(y_cols),
+        "pengguna": [_user_label(col, user_type) for col in y_cols for _ in range(len(hourly_avg))],
+        "nilai": pd.concat([hourly_avg[col] for col in y_cols], ignore_index=True),
+    })
+
+
+# 1. Line Chart rata-rata penyewaan per jam
+@instrument("chart.vega_line_chart_2")
+def vega_line_chart_2(df, x_col, y_col, title, user_type):
+    if df.empty:
+        raise ValueError("Tidak ada data untuk ditampilkan")
+    if not (pd.api.types.is_numeric_dtype(df[x_col]) and pd.api.types.is_numeric_dtype(df[y_col])):
+        raise ValueError(f"Kolom {x_col} atau {y_col} bukan numerik dan tidak bisa dihitung rata-ratanya.")
+    y_cols = ["HOUR_casual_replaced_upper", "HOUR_registered"] if user_type == "Semua Pengguna" else [y_col]
+    long = _hourly_long(df, "HOUR_hr", y_cols, user_type)
+    return _spec(title, _records(long), mark={"type": "line", "point": True}, encoding={
+        "x": {"field": "HOUR_hr", "type": "ordinal", "title": "Jam (HOUR_hr)", "axis": {"labelAngle": 0}},
+        "y": {"field": "nilai", "type": "quantitative", "title": "Rata-rata Penyewaan"},
+        "color": _user_color(list(dict.fromkeys(long["pengguna"]))),
+        "tooltip": [{"field": "HOUR_hr"}, {"field": "pengguna"}, {"field": "nilai", "format": ".1f"}],
+    })
+
+
+# 2. Bar Chart rata-rata penyewaan per jam (berdampingan untuk kedua jenis pengguna)
+@instrument("chart.vega_bar_chart_2")
+def vega_bar_chart_2(df, x_col, y_col, title, user_type):
+    if df.empty:
+        raise ValueError("Tidak ada data untuk ditampilkan")
+    y_cols = y_col if isinstance(y_col, list) else [y_col]
+    if not all(pd.api.types.is_numeric_dtype(df[col]) for col in y_cols):
+        raise ValueError(f"Kolom {' atau '.join(y_cols)} bukan numerik dan tidak bisa dihitung rata-ratanya.")
+    long = _hourly_long(df, x_col, y_cols, user_type)
+    encoding = {
+        "x": {"field": "HOUR_hr", "type": "ordinal", "title": "Jam (HOUR_hr)", "axis": {"labelAngle": 0}},
+        "xOffset": {"field": "pengguna", "sort": list(dict.fromkeys(long["pengguna"]))},
+        "y": {"field": "nilai", "type": "quantitative", "title": "Rata-rata Penyewaan"},
+        "color": _user_color(list(dict.fromkeys(long["pengguna"]))),
+    }
+    return _spec(title, _records(long), encoding=encoding, layer=[
+        {"mark": "bar", "encoding": {"tooltip": [{"field": "HOUR_hr"}, {"field": "pengguna"}, {"field": "nilai", "format": ".1f"}]}},
+        # Label nilai di atas batang (dibulatkan ke bawah seperti int() di versi matplotlib)
+        {"mark": {"type": "text", "dy": -6, "fontSize": 9, "color": "black"},
+         "encoding": {"text": {"field": "label", "type": "nominal"}},
+         "transform": [{"calculate": "floor(datum.nilai)", "as": "label"}]},
+    ])
+
+
+# 3. Pie Chart proporsi total kasual vs terdaftar
+@instrument("chart.vega_pie_chart_2")
+def vega_pie_chart_2(totals, x_col, y_col, title):
+    total_casual = float(totals['HOUR_casual_replaced_upper'])
+    total_registered = float(totals['HOUR_registered'])
+    total = total_casual + total_registered
+    if total == 0:
+        return _spec('Proporsi Penyewaan Kasual vs Terdaftar', [{"pengguna": "Tidak ada penyewaan", "persen": 100.0}],
+                     mark={"type": "arc", "color": "lightgray"}, encoding={"theta": {"field": "persen", "type": "quantitative"}})
+    slices = [{"pengguna": "Kasual", "persen": total_casual / total * 100},
+              {"pengguna": "Terdaftar", "persen": total_registered / total * 100}]
+    theta = {"field": "persen", "type": "quantitative", "stack": True}
+    return _spec('Proporsi Penyewaan Kasual vs Terdaftar Per Jam', slices, height=280,
+                 encoding={"theta": theta, "color": _user_color(["Kasual", "Terdaftar"])}, layer=[
+        {"mark": {"type": "arc", "outerRadius": 110}},
+        {"mark": {"type": "text", "radius": 70}, "encoding": {"text": {"field": "label", "type": "nominal"}},
+         "transform": [{"calculate": "format(datum.persen, '.1f') + '%'", "as": "label"}]},
+    ])